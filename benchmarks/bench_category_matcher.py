@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: CategoryMatcher vs the original list-scan category filter
+
+Usage (from the repository root):
+  python benchmarks/bench_category_matcher.py [--entries N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from category_matcher import CategoryMatcher  # noqa: E402
+
+WORDS = (
+    "the company said on tuesday that its new model would ship to customers "
+    "next quarter after regulators in europe raised questions about data use "
+    "and privacy while investors pushed for faster growth in cloud revenue"
+).split()
+TAGS = ["AI", "Apps", "Security", "Startups", "Government & Policy", "Hardware", "Fintech"]
+PHRASES = ["OpenAI", "generative AI", "Nvidia", "machine learning", "Sam Altman"]
+
+
+def make_entries(count: int, seed: int = 7) -> list[dict]:
+    """Build synthetic feed entries shaped like the simplified FeedCache entries"""
+    rng = random.Random(seed)
+    entries = []
+    for _ in range(count):
+        title = rng.sample(WORDS, 10)
+        summary = rng.choices(WORDS, k=45)
+        if rng.random() < 0.3:
+            summary.insert(rng.randrange(len(summary)), rng.choice(PHRASES))
+        entries.append(
+            {
+                "title": " ".join(title),
+                "summary": f"<p>{' '.join(summary)}</p>",
+                "tags": rng.sample(TAGS, rng.randint(0, 3)),
+            }
+        )
+    return entries
+
+
+def legacy_filter(entries: list[dict], category_set: list[str]) -> int:
+    """The original filter: exact, case-sensitive list scans over tags only"""
+    return sum(
+        1 for entry in entries if any(cat in category_set for cat in entry["tags"])
+    )
+
+
+def matcher_filter(entries: list[dict], matcher: CategoryMatcher) -> int:
+    return sum(1 for entry in entries if matcher.match(entry))
+
+
+def bench(label: str, func, repeat: int, count: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kept = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {count / best:>12,.0f} entries/s   kept {kept}/{count}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--config", default="config/categories.yaml")
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+
+    start = time.perf_counter()
+    matcher = CategoryMatcher.from_config(args.config)
+    print(f"Matcher built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    bench(
+        "legacy list scan (tags)",
+        lambda: legacy_filter(entries, matcher.categories),
+        args.repeat,
+        args.entries,
+    )
+    bench(
+        "matcher tags only",
+        lambda: sum(1 for e in entries if matcher.match_tags(e["tags"])),
+        args.repeat,
+        args.entries,
+    )
+    bench(
+        "matcher tags+title+summary",
+        lambda: matcher_filter(entries, matcher),
+        args.repeat,
+        args.entries,
+    )
+
+
+if __name__ == "__main__":
+    main()
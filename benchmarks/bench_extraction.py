@@ -0,0 +1,201 @@
+"""
+Benchmark: speed and quality of content extraction over a corpus of article pages
+
+Runs noise removal + density extraction (ContentExtractor.extract) over every
+<name>.html in the corpus and compares the text with <name>.txt, the golden
+article body. No network or browser is involved. The bundled corpus is
+synthetic (see make_extraction_fixtures.py).
+
+Usage (from the repository root):
+  python benchmarks/bench_extraction.py [--corpus DIR] [--repeat R] [--threshold T]
+                                        [--json FILE] [--baseline FILE] [--tolerance F]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from extractor import ContentExtractor  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "extraction")
+TOKEN_RE = re.compile(r"\w+")
+
+
+def load_corpus(corpus_dir: str) -> list[tuple[str, str, str]]:
+    """Return (name, html, golden text) for each page with a golden file"""
+    pages = []
+    for filename in sorted(os.listdir(corpus_dir)):
+        name, ext = os.path.splitext(filename)
+        golden_file = os.path.join(corpus_dir, f"{name}.txt")
+        if ext != ".html" or not os.path.exists(golden_file):
+            continue
+        with open(os.path.join(corpus_dir, filename), encoding="utf-8") as f:
+            page = f.read()
+        with open(golden_file, encoding="utf-8") as f:
+            golden = f.read()
+        pages.append((name, page, golden))
+    return pages
+
+
+def token_overlap(extracted: str, golden: str) -> dict:
+    """Bag-of-tokens precision, recall and F1 of `extracted` against `golden`"""
+    got = Counter(TOKEN_RE.findall(extracted.casefold()))
+    want = Counter(TOKEN_RE.findall(golden.casefold()))
+    common = sum((got & want).values())
+    precision = common / sum(got.values()) if got else 0.0
+    recall = common / sum(want.values()) if want else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if common else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(pages, extractor: ContentExtractor, threshold: float, repeat: int) -> dict:
+    # find_content_by_density reports each layer it walks; keep that out of
+    # both the timings and the benchmark output
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _, page, _ in pages:  # warm-up (regex compilation, imports)
+            extractor.extract(page, threshold)
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, page, _ in pages:
+                page_start = time.perf_counter()
+                extractor.extract(page, threshold)
+                latencies.append(time.perf_counter() - page_start)
+        elapsed = time.perf_counter() - start
+
+        quality = {}
+        peak_python = 0
+        for name, page, golden in pages:
+            tracemalloc.start()
+            text = extractor.extract(page, threshold)
+            peak_python = max(peak_python, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            quality[name] = token_overlap(text, golden)
+
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if platform.system() != "Darwin":
+        maxrss *= 1024
+
+    return {
+        "pages": len(pages),
+        "repeat": repeat,
+        "threshold": threshold,
+        "pages_per_sec": len(latencies) / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "memory_bytes": {
+            # tracemalloc sees Python objects only, not libxml2's own buffers
+            "peak_python_per_page": peak_python,
+            "max_rss": maxrss,
+        },
+        "quality": {
+            "mean_f1": statistics.mean(q["f1"] for q in quality.values()),
+            "min_f1": min(q["f1"] for q in quality.values()),
+            "mean_precision": statistics.mean(q["precision"] for q in quality.values()),
+            "mean_recall": statistics.mean(q["recall"] for q in quality.values()),
+            "pages": quality,
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return the regressions of `result` against `baseline`.
+
+    Speed may drop by `tolerance` (a fraction) before it counts; mean F1 may
+    not drop by more than 0.01.
+    """
+    problems = []
+    if result["pages_per_sec"] < baseline["pages_per_sec"] * (1 - tolerance):
+        problems.append(
+            f"pages/sec {result['pages_per_sec']:.1f} < baseline "
+            f"{baseline['pages_per_sec']:.1f}"
+        )
+    if result["latency_ms"]["p95"] > baseline["latency_ms"]["p95"] * (1 + tolerance):
+        problems.append(
+            f"p95 {result['latency_ms']['p95']:.2f} ms > baseline "
+            f"{baseline['latency_ms']['p95']:.2f} ms"
+        )
+    if result["quality"]["mean_f1"] < baseline["quality"]["mean_f1"] - 0.01:
+        problems.append(
+            f"mean F1 {result['quality']['mean_f1']:.3f} < baseline "
+            f"{baseline['quality']['mean_f1']:.3f}"
+        )
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Fail if slower or worse than this result file")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        print(f"No <name>.html + <name>.txt pairs found in {args.corpus}")
+        return 1
+
+    result = run(pages, ContentExtractor(), args.threshold, args.repeat)
+
+    print(f"{result['pages']} pages x {result['repeat']} runs")
+    print(f"{'throughput':<12} {result['pages_per_sec']:>10,.1f} pages/s")
+    latency = result["latency_ms"]
+    print(
+        f"{'latency':<12} p50 {latency['p50']:.2f} ms   p95 {latency['p95']:.2f} ms   "
+        f"max {latency['max']:.2f} ms"
+    )
+    memory = result["memory_bytes"]
+    print(
+        f"{'memory':<12} peak {memory['peak_python_per_page'] / 1024:,.0f} KiB "
+        f"Python heap per page, max RSS {memory['max_rss'] / 1024 / 1024:,.1f} MiB"
+    )
+    quality = result["quality"]
+    print(
+        f"{'quality':<12} mean F1 {quality['mean_f1']:.3f}   min F1 {quality['min_f1']:.3f}   "
+        f"precision {quality['mean_precision']:.3f}   recall {quality['mean_recall']:.3f}"
+    )
+    for name, scores in quality["pages"].items():
+        print(
+            f"  {name:<32} F1 {scores['f1']:.3f}  "
+            f"P {scores['precision']:.3f}  R {scores['recall']:.3f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(result, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION: {problem}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
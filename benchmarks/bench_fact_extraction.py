@@ -0,0 +1,168 @@
+"""
+Check and benchmark: FactExtractor against the local stand-in chat-completions server
+
+Each scenario extracts facts for a batch of articles through FactExtractor
+while the server answers some requests with 429 or 503 (with Retry-After),
+and checks that every article ends up with exactly one fact, that every
+rejected request was retried and that no retry came before its Retry-After.
+A last scenario rejects every request: all articles must fail without
+writing a fact. Exits non-zero if a scenario loses, duplicates or
+mismatches facts, or retries too early.
+
+Usage (from the repository root):
+  python benchmarks/bench_fact_extraction.py [--articles N] [--concurrency N]
+                                             [--retry-after S] [--latency S]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from article_stream import iter_jsonl_articles  # noqa: E402
+from fact_extraction import FactExtractor  # noqa: E402
+from llm_standin import StandInLLMServer  # noqa: E402
+
+# name, stand-in server options
+SCENARIOS = [
+    ("healthy", {}),
+    ("429 every 3rd request", {"rate_limit_every": 3}),
+    ("503 every 4th request", {"error_every": 4}),
+    ("429 every 3rd, 503 every 5th", {"rate_limit_every": 3, "error_every": 5}),
+]
+
+
+def make_articles(count: int):
+    return [
+        {
+            "title": f"Lab ships model {i}",
+            "link": f"https://example.com/story-{i}",
+            "published": "2026-01-01",
+            "content": f"Lab ships model {i}\n"
+            + f"The lab said model {i} is faster than its predecessor. " * 20,
+        }
+        for i in range(count)
+    ]
+
+
+def extract(server, articles, concurrency, max_attempts, output_file):
+    """Run a FactExtractor against `server`; returns its stats and the seconds
+    taken. Rate limits are set high enough to never delay a request."""
+    extractor = FactExtractor(
+        base_url=server.base_url,
+        api_key="x",
+        model="stand-in",
+        concurrency=concurrency,
+        requests_per_minute=1_000_000,
+        tokens_per_minute=1_000_000_000,
+        max_attempts=max_attempts,
+        timeout=10,
+        output_file=output_file,
+        use_cache=False,
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(extractor.run(articles))
+    return extractor.stats, time.perf_counter() - start
+
+
+def run(name, options, articles, concurrency, retry_after, latency) -> bool:
+    server = StandInLLMServer(
+        latency=latency, retry_after=retry_after, **options
+    ).start()
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, "facts.jsonl")
+        try:
+            stats, seconds = extract(server, articles, concurrency, 6, output_file)
+        finally:
+            server.stop()
+        facts = list(iter_jsonl_articles(output_file))
+
+    headlines = {fact["original_article"]["link"]: fact["headline"] for fact in facts}
+    expected = {article["link"]: article["title"] for article in articles}
+    rejected = server.rate_limited + server.errors
+    gap = server.min_retry_gap()
+    ok = (
+        stats["extracted"] == len(facts) == len(headlines) == len(articles)
+        and headlines == expected
+        and stats["retries"] == rejected
+        and (gap is None or gap >= retry_after * 0.95)
+    )
+    print(
+        f"{name:<30} {stats['extracted']:>4} facts {stats['failed']:>3} failed "
+        f"{server.rate_limited:>3} x429 {server.errors:>3} x503 "
+        f"{stats['retries']:>3} retries  min wait "
+        f"{'-' if gap is None else f'{gap:.2f}s':>6} "
+        f"{len(articles) / seconds:>7,.1f} articles/s  {'ok' if ok else 'FAILED'}"
+    )
+    return ok
+
+
+def run_all_rejected(articles, concurrency, retry_after) -> bool:
+    """Every request gets a 429: each article fails after its last attempt"""
+    attempts = 2
+    server = StandInLLMServer(rate_limit_every=1, retry_after=retry_after).start()
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, "facts.jsonl")
+        try:
+            stats, _ = extract(server, articles, concurrency, attempts, output_file)
+        finally:
+            server.stop()
+        facts = []
+        if os.path.exists(output_file):
+            facts = list(iter_jsonl_articles(output_file))
+    ok = (
+        stats["extracted"] == 0
+        and not facts
+        and stats["failed"] == len(articles)
+        and server.requests == attempts * len(articles)
+    )
+    print(
+        f"{'429 on every request':<30} {stats['extracted']:>4} facts "
+        f"{stats['failed']:>3} failed {server.requests:>4} requests  "
+        f"{'ok' if ok else 'FAILED'}"
+    )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=0.2,
+        help="Retry-After seconds the server sends with 429 and 503",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="Server seconds per request"
+    )
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles)
+    ok = all(
+        [
+            run(
+                name,
+                options,
+                articles,
+                args.concurrency,
+                args.retry_after,
+                args.latency,
+            )
+            for name, options in SCENARIOS
+        ]
+    )
+    rejected = run_all_rejected(articles[:8], args.concurrency, args.retry_after)
+    return 0 if ok and rejected else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
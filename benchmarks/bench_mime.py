@@ -0,0 +1,150 @@
+"""
+Benchmark: per-message CPU cost of building newsletter emails
+
+Compares the old per-recipient construction (a new MIMEMultipart + MIMEText
+of the whole HTML, serialized for every address) with MessageFactory, which
+encodes the body once and splices in only each recipient's headers and
+unsubscribe link. Bodies are the real newsletter template, padded to each
+requested size. With --send, both paths also deliver through a local
+stand-in SMTP server (benchmarks/smtp_standin.py).
+
+Usage (from the repository root):
+  python benchmarks/bench_mime.py [--sizes 10,100,1000] [--messages N] [--send]
+"""
+
+import argparse
+import email
+import os
+import smtplib
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from email.policy import default
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from email_service import EmailConfig, NewsletterSender, SubscriberManager  # noqa: E402
+from smtp_standin import StandInSMTPServer  # noqa: E402
+
+
+def make_sender() -> NewsletterSender:
+    config = EmailConfig()
+    config.sender_email = "newsletter@example.com"
+    config.sender_name = "DSEC AI Newsletter"
+    config.unsubscribe_url = "https://example.com/unsubscribe?email={email}"
+    return NewsletterSender(config, SubscriberManager("", ":memory:"))
+
+
+def newsletter_html(sender: NewsletterSender, size_kb: int) -> str:
+    """The newsletter template with article blocks repeated to ~`size_kb` KB"""
+    articles = [
+        {
+            "title": f"Article {i}: chips, models and the week in AI",
+            "link": f"https://example.com/news/{i}",
+            "Category": ["AI", "Machine Learning"],
+            "published": "Mon, 12 Oct 2026 10:00:00 +0000",
+            "summary": "Researchers released a new open model today. " * 6,
+        }
+        for i in range(10)
+    ]
+    html = sender.create_html_template(articles)
+    head, _, tail = html.partition('<div class="footer">')
+    padding = head[head.index("<div style=") :]
+    while len(head.encode()) < size_kb * 1024:
+        head += padding
+    return f'{head}<div class="footer">{tail}'
+
+
+def legacy_message(sender: NewsletterSender, html: str, recipient: str) -> bytes:
+    """The message as send_newsletter built it before MessageFactory"""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = "DSEC AI Newsletter - October 12, 2026"
+    msg["From"] = f"{sender.config.sender_name} <{sender.config.sender_email}>"
+    msg["To"] = recipient
+    msg.attach(MIMEText(html, "html"))
+    return msg.as_bytes()
+
+
+def cpu_per_message(build, messages: int) -> float:
+    """Mean CPU seconds per built message"""
+    start = time.process_time()
+    for i in range(messages):
+        build(f"reader{i}@example.com")
+    return (time.process_time() - start) / messages
+
+
+def check(sender: NewsletterSender, html: str, raw: bytes) -> None:
+    """The spliced message must decode to the template with the link filled in"""
+    recipient = "reader0@example.com"
+    body = email.message_from_bytes(raw, policy=default).get_body(("html",))
+    expected = html.replace(
+        "{unsubscribe_link}", sender.unsubscribe_link(recipient).replace("&", "&amp;")
+    )
+    if body.get_content().replace("\r\n", "\n") != expected:
+        raise SystemExit("MessageFactory output does not match the template")
+
+
+def send_all(server: StandInSMTPServer, build, sendmail: bool, messages: int) -> float:
+    """Wall-clock seconds to build and deliver `messages` over one connection"""
+    start = time.perf_counter()
+    with smtplib.SMTP("127.0.0.1", server.port) as smtp:
+        for i in range(messages):
+            recipient = f"reader{i}@example.com"
+            if sendmail:
+                smtp.sendmail("newsletter@example.com", [recipient], build(recipient))
+            else:
+                smtp.send_message(build(recipient))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Newsletter message construction benchmark")
+    parser.add_argument("--sizes", default="10,100,1000", help="Body sizes in KB")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument(
+        "--send", action="store_true", help="Also deliver via a local stand-in SMTP server"
+    )
+    args = parser.parse_args()
+
+    sender = make_sender()
+    print(
+        f"{'body KB':>8} {'msg KB':>7} {'legacy us/msg':>14} "
+        f"{'factory us/msg':>15} {'speedup':>8}"
+    )
+    for size in (int(s) for s in args.sizes.split(",")):
+        html = newsletter_html(sender, size)
+        factory = sender.create_message_factory(html)
+        check(sender, html, factory.render("reader0@example.com"))
+        messages = max(args.messages * 10 // max(size, 10), 20)
+
+        legacy = cpu_per_message(lambda r: legacy_message(sender, html, r), messages)
+        spliced = cpu_per_message(factory.render, messages)
+        message_kb = len(factory.render("reader0@example.com")) / 1024
+        print(
+            f"{size:>8} {message_kb:>7.0f} {legacy * 1e6:>14.0f} "
+            f"{spliced * 1e6:>15.0f} {legacy / spliced:>7.1f}x"
+        )
+
+        if args.send:
+            server = StandInSMTPServer().start()
+            try:
+
+                def build_legacy(recipient):
+                    return email.message_from_bytes(
+                        legacy_message(sender, html, recipient)
+                    )
+
+                slow = send_all(server, build_legacy, False, messages)
+                fast = send_all(server, factory.render, True, messages)
+            finally:
+                server.stop()
+            print(
+                f"{'':>8} delivery of {messages} messages: legacy {slow:.2f}s, "
+                f"factory {fast:.2f}s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
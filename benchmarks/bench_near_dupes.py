@@ -0,0 +1,187 @@
+"""
+Check and benchmark: near-duplicate detection on feed titles and summaries
+
+Runs NearDuplicateIndex.for_summaries() (the index main() uses before
+scraping) over short, real-looking feed entries: distinct stories about the
+same company must all be kept, and copies of one story from several
+publishers must be dropped. It then measures how often pairs of synthetic
+20-30 word sets at a given true Jaccard similarity are flagged, both with the
+stored words and from the MinHash estimate alone. Exits non-zero if a
+distinct story is dropped, a copy is kept, any pair below the 0.5 threshold
+is flagged with the stored words, or more than 1% of the pairs at J <= 0.35
+are flagged by the estimate alone.
+
+Usage (from the repository root):
+  python benchmarks/bench_near_dupes.py [--pairs N] [--jaccard 0.35,0.45,0.7,0.8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from near_dupes import (  # noqa: E402
+    MinHasher,
+    NearDuplicateIndex,
+    jaccard,
+    shingle_hashes,
+    shingles,
+    similarity,
+    summary_text,
+)
+
+# (link, title, summary)
+DISTINCT = [  # pairs about the same company
+    (
+        "https://example.com/a/openai-gpt5",
+        "OpenAI launches GPT-5",
+        "OpenAI has released GPT-5, its newest flagship model, to ChatGPT users.",
+    ),
+    (
+        "https://example.com/b/openai-sora",
+        "OpenAI launches Sora app",
+        "OpenAI launched a standalone Sora app for making and sharing AI videos.",
+    ),
+    (
+        "https://example.com/c/nvidia-q2",
+        "Nvidia earnings beat expectations on data center demand",
+        "Nvidia reported record quarterly revenue as data center sales grew.",
+    ),
+    (
+        "https://example.com/d/nvidia-guidance",
+        "Nvidia shares fall despite earnings beat as China sales stall",
+        "Nvidia stock slipped after earnings as export limits hit China sales.",
+    ),
+    (
+        "https://example.com/e/google-gemini",
+        "Google releases Gemini 3 with improved reasoning",
+        "Google said Gemini 3 is rolling out to the Gemini app and developers.",
+    ),
+    (
+        "https://example.com/f/google-antitrust",
+        "Google appeals antitrust ruling over search deals",
+        "Google filed an appeal against the ruling on its default search deals.",
+    ),
+    ("https://example.com/h/gpt5", "OpenAI launches GPT-5", ""),
+    ("https://example.com/i/sora", "OpenAI launches Sora app", ""),
+]
+COPIES = [  # one story from three publishers
+    (
+        "https://example.com/g/anthropic-funding",
+        "Anthropic raises $13 billion in new funding round",
+        "Anthropic raised $13 billion at a $183 billion valuation, the AI startup "
+        "said on Tuesday, as investors pour money into frontier model makers.",
+    ),
+    (
+        "https://example.org/g/anthropic-raises-13b",
+        "Anthropic raises $13 billion in funding round",
+        "AI startup Anthropic said on Tuesday it raised $13 billion at a $183 "
+        "billion valuation as investors pour money into frontier model makers.",
+    ),
+    (
+        "https://example.net/g/anthropic-13-billion",
+        "Anthropic raises $13 billion at $183 billion valuation",
+        "The AI startup Anthropic raised $13 billion in a new funding round at a "
+        "$183 billion valuation, it said on Tuesday.",
+    ),
+]
+
+
+def entries(stories):
+    return [{"link": link, "title": t, "summary": s} for link, t, s in stories]
+
+
+def check_feed_entries() -> bool:
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        index = NearDuplicateIndex.for_summaries(os.path.join(directory, "index.json"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            kept = index.filter_new(entries(DISTINCT + COPIES), summary_text)
+    links = {a["link"] for a in kept}
+    for link, *_ in DISTINCT:
+        if link not in links:
+            print(f"FAILED: distinct story dropped: {link}")
+            ok = False
+    copies_kept = sum(1 for link, *_ in COPIES if link in links)
+    if copies_kept != 1:
+        print(f"FAILED: {copies_kept} of {len(COPIES)} copies of one story kept")
+        ok = False
+
+    hasher = MinHasher()
+    words = [shingles(summary_text(a), 1) for a in entries(DISTINCT)]
+    print(f"{'distinct pair':<42} {'jaccard':>8} {'minhash':>8}")
+    for i in range(0, len(DISTINCT), 2):
+        left, right = (shingle_hashes(w) for w in words[i : i + 2])
+        name = f"{DISTINCT[i][1][:19]} / {DISTINCT[i + 1][1][:19]}"
+        estimate = similarity(hasher.signature(left), hasher.signature(right))
+        print(f"{name:<42} {jaccard(left, right):>8.2f} {estimate:>8.2f}")
+    print(f"{'feed entries':<42} {'ok' if ok else 'FAILED'}")
+    return ok
+
+
+def synthetic_pair(rng: random.Random, target: float):
+    """Two sets of 20-30 tokens with Jaccard similarity close to `target`"""
+    size = rng.randint(20, 30)
+    shared = round(2 * size * target / (1 + target))
+    common = [f"w{rng.getrandbits(40)}" for _ in range(shared)]
+    left = common + [f"w{rng.getrandbits(40)}" for _ in range(size - shared)]
+    right = common + [f"w{rng.getrandbits(40)}" for _ in range(size - shared)]
+    return shingle_hashes(left), shingle_hashes(right)
+
+
+def flag_rates(target: float, pairs: int, seed: int = 7):
+    """Share of pairs flagged at the 0.5 threshold, with the stored words and
+    from the estimate alone, and the mean seconds per pair"""
+    rng = random.Random(seed)
+    missing = os.path.join(tempfile.gettempdir(), "bench-near-dupes-none.json")
+    flagged = estimated = 0
+    start = time.perf_counter()
+    for _ in range(pairs):
+        left, right = synthetic_pair(rng, target)
+        index = NearDuplicateIndex(missing, shingle_size=1, keep_shingles=True)
+        left_signature = index.hasher.signature(left)
+        right_signature = index.hasher.signature(right)
+        index.add("left", {"signature": left_signature, "shingles": left})
+        flagged += bool(
+            index.find_duplicate(
+                "right", {"signature": right_signature, "shingles": right}
+            )
+        )
+        estimated += bool(
+            index.find_duplicate("right", {"signature": right_signature})
+        )
+    return flagged / pairs, estimated / pairs, (time.perf_counter() - start) / pairs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument(
+        "--jaccard", default="0.35,0.45,0.7,0.8", help="True similarities"
+    )
+    args = parser.parse_args()
+
+    ok = check_feed_entries()
+    print(f"\n{'true J':>7} {'flagged':>8} {'estimate only':>14} {'us/pair':>8}")
+    for target in (float(j) for j in args.jaccard.split(",")):
+        exact, estimate, seconds = flag_rates(target, args.pairs)
+        verdict = ""
+        if target < 0.5:
+            passed = exact == 0 and (target > 0.35 or estimate <= 0.01)
+            verdict = "ok" if passed else "FAILED"
+            ok = ok and passed
+        print(
+            f"{target:>7.2f} {exact:>8.2%} {estimate:>14.2%} "
+            f"{seconds * 1e6:>8.0f}  {verdict}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""
+Check and benchmark: SMTPPool delivery against the local stand-in SMTP server
+
+Each scenario sends to a batch of recipients through SMTPPool and checks that
+every one was accepted by the server exactly once, including when the server
+drops connections or turns away sessions beyond a concurrency limit (so some
+of the pool's connections never open or cannot reopen). Exits non-zero if a
+scenario loses or fails recipients.
+
+Usage (from the repository root):
+  python benchmarks/bench_smtp_pool.py [--recipients N] [--latency S]
+"""
+
+import argparse
+import logging
+import os
+import smtplib
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from smtp_pool import SMTPPool  # noqa: E402
+from smtp_standin import StandInSMTPServer  # noqa: E402
+
+# name, pool connections, messages per connection, stand-in server options
+SCENARIOS = [
+    ("healthy", 4, 100, {}),
+    ("drops every 37 messages", 4, 100, {"drop_every": 37}),
+    ("2 sessions allowed", 4, 100, {"max_sessions": 2}),
+    ("2 sessions, recycle every 20", 4, 20, {"max_sessions": 2}),
+    ("1 session, drops every 50", 8, 100, {"max_sessions": 1, "drop_every": 50}),
+]
+
+
+def connector(port: int):
+    def connect():
+        try:
+            server = smtplib.SMTP("127.0.0.1", port, timeout=10)
+            server.login("me@example.com", "x")
+            return server
+        except (smtplib.SMTPException, OSError):
+            return None
+
+    return connect
+
+
+def run(name, connections, max_messages, options, recipients, latency) -> bool:
+    server = StandInSMTPServer(latency=latency, **options).start()
+    try:
+        pool = SMTPPool(
+            connector(server.port), connections=connections, max_messages=max_messages
+        )
+        result = pool.send(
+            (f"reader{i}@example.com" for i in range(recipients)),
+            lambda smtp, email: smtp.sendmail("me@example.com", [email], b"Hi\r\n"),
+        )
+    finally:
+        server.stop()
+    ok = result["success"] == recipients == server.messages - server.drops
+    print(
+        f"{name:<30} {result['success']:>5} sent {result['failed']:>4} failed "
+        f"{result['connected']:>2}/{connections} opened {server.refused:>3} refused "
+        f"{recipients / result['seconds']:>8,.0f} msg/s  {'ok' if ok else 'FAILED'}"
+    )
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--recipients", type=int, default=200)
+    parser.add_argument(
+        "--latency", type=float, default=0.002, help="Server seconds per message"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    ok = all(
+        [
+            run(name, connections, max_messages, options, args.recipients, args.latency)
+            for name, connections, max_messages, options in SCENARIOS
+        ]
+    )
+
+    # No server at all: nothing opens, nothing is sent
+    closed = StandInSMTPServer()
+    closed.server_close()
+    result = SMTPPool(connector(closed.port), connections=4).send(
+        ["reader@example.com"], lambda smtp, email: None
+    )
+    unreachable = result["connected"] == 0 and result["success"] == 0
+    print(f"{'server unreachable':<30} {'ok' if unreachable else 'FAILED'}")
+    return 0 if ok and unreachable else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
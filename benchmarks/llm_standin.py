@@ -0,0 +1,230 @@
+"""
+Local stand-in chat-completions server for exercising FactExtractor without an LLM
+
+Answers OpenAI-compatible POST .../chat/completions requests with a fixed
+structured fact (its headline is the first line of the article content) and a
+`usage` block, and counts what it receives. It can add per-request latency,
+answer every Nth request with 429 and every Mth with 503 (both carrying
+Retry-After, like a rate-limited provider), and records when each article was
+retried so callers can check that Retry-After was waited out.
+
+Usage (from the repository root):
+  python benchmarks/llm_standin.py [--port 8000] [--latency S]
+                                   [--rate-limit-every N] [--error-every N]
+                                   [--retry-after S]
+
+then extract with:
+  python src/fact_extraction.py --limit 5 --base-url http://127.0.0.1:8000/v1 \\
+                                --no-cache --output /tmp/facts.jsonl
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+class StandInLLMServer(ThreadingHTTPServer):
+    """Threaded chat-completions stand-in; `start()` serves in the background"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        error_every: int = 0,
+        retry_after: float = 1.0,
+    ):
+        super().__init__((host, port), ChatCompletionsHandler)
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.error_every = error_every
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.completions = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.tokens = 0
+        # Article content -> (monotonic time, status) of every request for it
+        self.attempts: Dict[str, List[Tuple[float, int]]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.port}/v1"
+
+    def start(self) -> "StandInLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def record(self, content: str) -> int:
+        """Count a request; returns the status to answer it with"""
+        with self.lock:
+            self.requests += 1
+            status = 200
+            if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+                status = 429
+                self.rate_limited += 1
+            elif self.error_every and self.requests % self.error_every == 0:
+                status = 503
+                self.errors += 1
+            else:
+                self.completions += 1
+            self.attempts.setdefault(content, []).append((time.monotonic(), status))
+            return status
+
+    def min_retry_gap(self) -> Optional[float]:
+        """Shortest wait between a rejected request and the retry of the same
+        article, or None if nothing was retried"""
+        gaps = [
+            later[0] - earlier[0]
+            for attempts in self.attempts.values()
+            for earlier, later in zip(attempts, attempts[1:])
+            if earlier[1] != 200
+        ]
+        return min(gaps) if gaps else None
+
+
+class ChatCompletionsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def reply(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        server: StandInLLMServer = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length))
+            messages = payload["messages"]
+        except (ValueError, KeyError, TypeError):
+            self.reply(400, {"error": {"message": "invalid request body"}})
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.reply(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        content = messages[-1]["content"] if messages else ""
+        status = server.record(content)
+        if server.latency:
+            time.sleep(server.latency)
+        if status != 200:
+            self.reply(
+                status,
+                {"error": {"message": "stand-in rejected the request"}},
+                {"Retry-After": f"{server.retry_after:g}"},
+            )
+            return
+
+        article = content.split("<<<", 1)[-1].split(">>>", 1)[0].strip()
+        fact = {
+            "headline": article.splitlines()[0] if article else "",
+            "summary_1_sentence": "",
+            "key_points": {},
+            "relevance": 5.0,
+            "impact_score": 5.0,
+            "student_relevance": 5.0,
+            "long_term_importance": 5.0,
+            "deduplication_hint": "",
+        }
+        prompt_tokens = sum(len(m["content"].split()) for m in messages)
+        completion_tokens = 40
+        with server.lock:
+            server.tokens += prompt_tokens + completion_tokens
+        self.reply(
+            200,
+            {
+                "id": f"chatcmpl-standin-{server.requests}",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": json.dumps(fact)},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Local stand-in chat-completions server"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait per request"
+    )
+    parser.add_argument(
+        "--rate-limit-every",
+        type=int,
+        default=0,
+        help="Answer every Nth request with 429",
+    )
+    parser.add_argument(
+        "--error-every", type=int, default=0, help="Answer every Nth request with 503"
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds sent with 429 and 503",
+    )
+    args = parser.parse_args()
+
+    server = StandInLLMServer(
+        args.host,
+        args.port,
+        args.latency,
+        args.rate_limit_every,
+        args.error_every,
+        args.retry_after,
+    )
+    print(f"Stand-in chat-completions server on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(
+            f"Received {server.requests} requests: {server.completions} completed, "
+            f"{server.rate_limited} rate-limited, {server.errors} errors, "
+            f"~{server.tokens} tokens"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
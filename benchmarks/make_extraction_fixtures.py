@@ -0,0 +1,374 @@
+"""
+Generate the synthetic extraction corpus in benchmarks/fixtures/extraction
+
+The corpus is NOT saved publisher HTML. Each <name>.txt is a hand-written
+article body (the golden text), and this script renders <name>.html around
+it in a template imitating the markup one publisher uses: navigation menus,
+a cookie banner, share buttons, related and "most popular" lists, in-body
+figures, ad slots, newsletter sign-ups, footers and a large inline
+JSON state blob. A fixed seed keeps the output byte-for-byte reproducible.
+
+Pages generated here show whether the extractor still finds the body in
+these structures; they cannot show how it fares on markup the templates do
+not imitate. Saved real pages with a hand-checked .txt can be added next to
+them (see "Benchmarking Extraction" in the README).
+
+Usage (from the repository root):
+  python benchmarks/make_extraction_fixtures.py [--out DIR]
+"""
+
+import argparse
+import json
+import os
+import random
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "extraction")
+SEED = 3
+
+# Golden name -> headline, in generation order (the order consumes the seed)
+TITLES = {
+    "guardian-ai-regulation": (
+        "UK regulators set out first rules for frontier AI models"
+    ),
+    "guardian-chip-supply": (
+        "Chipmakers race to expand capacity as demand for AI hardware soars"
+    ),
+    "nytimes-quantum-startup": (
+        "A Quantum Computing Start-Up Bets on a Different Kind of Qubit"
+    ),
+    "nytimes-social-media-teens": (
+        "States Move to Limit Teenagers' Use of Social Media Apps"
+    ),
+    "wired-battery-recycling": (
+        "The Race to Recycle Electric Car Batteries Is Just Getting Started"
+    ),
+    "wired-password-managers": "Why Passkeys Still Haven't Replaced Your Passwords",
+    "techcrunch-seed-round": (
+        "Developer tools startup raises $12M seed to automate code review"
+    ),
+    "techcrunch-security-breach": (
+        "Hackers stole customer data from a popular fitness app, company confirms"
+    ),
+}
+
+NAV_WORDS = [
+    "World", "UK", "Business", "Technology", "Science", "Climate", "Culture",
+    "Sport", "Opinion", "Lifestyle", "Video", "Podcasts", "Newsletters", "Games",
+]  # fmt: skip
+RELATED = [
+    "Ten gadgets we loved this year",
+    "How to secure your home network",
+    "The best laptops for students",
+    "Inside the race for faster chips",
+    "What the new privacy rules mean for you",
+    "Why your phone battery drains so fast",
+]
+FOOTER_LINKS = [
+    "About us", "Contact", "Complaints", "Terms", "Privacy policy",
+    "Cookie settings", "Advertise", "Jobs", "Help",
+]  # fmt: skip
+
+
+def read_golden(path: str) -> list[str]:
+    """Paragraphs of a golden file (blank-line separated, wrapped lines)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [" ".join(p.split("\n")) for p in f.read().strip().split("\n\n")]
+
+
+def slug(title: str) -> str:
+    return title.lower().replace(" ", "-")[:40]
+
+
+def script_blob(rng: random.Random) -> str:
+    """Inline page state, the bulk of a real news page's HTML"""
+    data = {
+        "user": None,
+        "ab": {f"exp{i}": rng.random() < 0.5 for i in range(200)},
+        "slots": [f"slot-{i}" for i in range(12)],
+        "cards": [
+            {
+                "id": rng.getrandbits(48),
+                "headline": rng.choice(RELATED),
+                "url": f"/story/{rng.getrandbits(32)}",
+                "image": {
+                    "src": f"/img/{rng.getrandbits(40):x}.jpg",
+                    "w": 1200,
+                    "h": 675,
+                },
+            }
+            for _ in range(600)
+        ],
+    }
+    return (
+        f"<script>window.__STATE__ = {json.dumps(data)};\n"
+        "function track(e){return (window.dataLayer=window.dataLayer||[]).push(e)}"
+        "</script>"
+    )
+
+
+def nav(rng: random.Random, cls: str = "nav") -> str:
+    items = "".join(
+        f'<li class="{cls}-item"><a href="/{w.lower()}">{w}</a><ul class="{cls}-sub">'
+        + "".join(
+            f'<li><a href="/{w.lower()}/{v.lower()}">{v}</a></li>'
+            for v in rng.sample(NAV_WORDS, 10)
+        )
+        + "</ul></li>"
+        for w in NAV_WORDS
+    )
+    return f'<nav class="{cls}" aria-label="Primary"><ul>{items}</ul></nav>'
+
+
+def related_list(rng: random.Random, cls: str) -> str:
+    headlines = rng.sample(RELATED, 4)
+    items = "".join(
+        f'<li><a href="/r/{i}">{t}</a></li>' for i, t in enumerate(headlines)
+    )
+    return f'<aside class="{cls}"><h2>Related stories</h2><ul>{items}</ul></aside>'
+
+
+def share(cls: str) -> str:
+    return (
+        f'<div class="{cls}"><button>Share on Facebook</button>'
+        "<button>Share on X</button><button>Email</button><button>Copy link</button>"
+        "</div>"
+    )
+
+
+def trending(rng: random.Random) -> str:
+    # "Most popular" modules are headline lists; teasers come from __STATE__
+    headlines = rng.sample(RELATED, 6)
+    items = "".join(
+        f'<li><a href="/t/{i}">{t}</a></li>' for i, t in enumerate(headlines)
+    )
+    return (
+        '<section class="trending-list"><h2>Most popular</h2>'
+        f"<ol>{items}</ol></section>"
+    )
+
+
+def footer() -> str:
+    links = "".join(f'<a href="/f/{i}">{w}</a> ' for i, w in enumerate(FOOTER_LINKS))
+    return (
+        f'<footer class="site-footer"><div>{links}</div>'
+        "<p>© 2025 Publisher Media Ltd. All rights reserved.</p></footer>"
+    )
+
+
+def cookie() -> str:
+    return (
+        '<div id="consent-banner" class="cookie-consent"><p>We use cookies to '
+        "improve your experience and to show you personalised ads. You can change "
+        "your preferences at any time.</p><button>Accept all</button>"
+        "<button>Manage</button></div>"
+    )
+
+
+def guardian(rng: random.Random, title: str, paras: list[str]) -> str:
+    body = ""
+    for i, p in enumerate(paras):
+        body += f"<p>{p}</p>\n"
+        if i == 1:
+            body += (
+                '<figure class="element element-image"><img src="/img/inline.jpg" '
+                'alt=""><figcaption><span class="inline-caption">The announcement '
+                "followed months of talks with industry.</span> Photograph: Jane "
+                "Smith/PA</figcaption></figure>\n"
+            )
+        if i == 2:
+            body += (
+                '<aside class="element-rich-link"><p>Related: <a href="/x">Ministers '
+                "accused of dragging feet on AI oversight</a></p></aside>\n"
+            )
+    return f"""<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">\
+<title>{title} | Technology | The Guardian</title>
+<link rel="canonical" href="https://www.theguardian.com/technology/2025/{slug(title)}">
+<link rel="stylesheet" href="/static/main.css">{script_blob(rng)}</head>
+<body><header class="site-header"><a href="/">The Guardian</a>{nav(rng, "pillar")}\
+<div class="subnav"><a href="/tech">Technology</a> \
+<a href="/ai">Artificial intelligence (AI)</a></div></header>
+{cookie()}
+<main id="maincontent"><article class="content">
+<div class="content__labels"><a href="/technology">Technology</a></div>
+<h1 class="content__headline">{title}</h1>
+<div class="content__standfirst"><p>Analysis of what the change means.</p></div>
+<div class="meta"><address>Alex Morgan, Technology correspondent</address>\
+<time>Tue 14 Oct 2025 07.00 BST</time>{share("meta__social")}</div>
+<figure class="media-primary"><img src="/img/lead.jpg" alt="">\
+<figcaption>Photograph: Agency</figcaption></figure>
+<div class="article-body-commercial-selector" id="article-body">
+{body}</div>
+<div class="submeta"><a href="/topics/a">Artificial intelligence (AI)</a> \
+<a href="/topics/b">Regulation</a></div>
+{share("submeta__share")}
+</article>
+<div class="ad-slot ad-slot--right"><div id="dfp-ad--right">Advertisement</div></div>
+{related_list(rng, "onward-related")}
+<div class="newsletter-signup"><h3>Sign up to TechScape</h3><p>A weekly dive into how \
+technology is shaping our lives.</p><form><input type="email"><button>Sign up</button>\
+</form></div>
+<div id="comments" data-discussion-id="/p/abc123"></div>
+{trending(rng)}</main>{footer()}
+<script src="/static/commercial.js"></script></body></html>"""
+
+
+def nytimes(rng: random.Random, title: str, paras: list[str]) -> str:
+    groups = [paras[i : i + 2] for i in range(0, len(paras), 2)]
+    body = ""
+    for i, group in enumerate(groups):
+        ps = "".join(f'<p class="css-at9mc1 evys1bk0">{p}</p>' for p in group)
+        body += (
+            '<div class="css-53u6y8 StoryBodyCompanionColumn">'
+            f'<div class="css-1fanzo5">{ps}</div></div>\n'
+        )
+        if i == 0:
+            body += (
+                '<div class="ad dfp-ad-mid1-wrapper"><div id="mid1">Advertisement'
+                "</div><p>SKIP ADVERTISEMENT</p></div>\n"
+            )
+    return f"""<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">\
+<title>{title} - The New York Times</title>
+<link rel="canonical" href="https://www.nytimes.com/2025/10/14/technology/\
+{slug(title)}.html">
+{script_blob(rng)}<style>.css-at9mc1{{margin:0 0 1em}}</style></head>
+<body><div id="app"><div class="css-1kj7lfb"><a href="#site-content" \
+class="css-skip">Skip to content</a><a href="#site-index">Skip to site index</a></div>
+<header class="css-ahe4g0 NYTAppHideMasthead">{nav(rng, "css-1d8a290")}\
+<div class="css-login"><button>Log in</button><button>Subscribe for $1/week</button>\
+</div></header>
+<main id="site-content"><div class="css-1vxca1d">\
+<article id="story" class="css-1vxca1d">
+<header class="css-d92tdd"><h1 data-testid="headline" class="css-88wicj">{title}</h1>
+<p id="article-summary" class="css-79rysd">The move reflects a broader shift.</p>
+<div class="css-byline"><p class="css-aknsld">By <span>Jordan Lee</span></p>\
+<time datetime="2025-10-14">Oct. 14, 2025</time></div>
+{share("css-share-tools")}</header>
+<section name="articleBody" class="meteredContent css-1r7ky0e">
+{body}</section>
+<div class="bottom-of-article"><div class="css-1jp38cr"><p>A version of this article \
+appears in print on Oct. 15, 2025, Section B, Page 1.</p><a href="/order">Order \
+Reprints</a> | <a href="/paper">Today's Paper</a> | <a href="/sub">Subscribe</a></div>\
+</div>
+</article></div>
+<div class="css-related-links">{related_list(rng, "css-1l4spti")}</div>
+</main>
+<div id="site-index"><h2>Site Index</h2>{nav(rng, "css-site-index")}</div>\
+{trending(rng)}{footer()}</div></body></html>"""
+
+
+def wired(rng: random.Random, title: str, paras: list[str]) -> str:
+    body = ""
+    for i, p in enumerate(paras):
+        body += f"<p>{p}</p>\n"
+        if i == 2:
+            body += (
+                '<figure class="asset-embed"><img src="/photos/inline.jpg"><figcaption>'
+                '<span class="caption__text">A processing line at a plant in Nevada.'
+                '</span><span class="caption__credit">Photograph: Getty Images</span>'
+                "</figcaption></figure>\n"
+            )
+        if i == 1:
+            body += (
+                '<div class="ad__slot ad__slot--in-content"><span>Advertisement</span>'
+                "</div>\n"
+            )
+        if i == 3:
+            body += (
+                '<div class="journey-unit newsletter-inline"><p>Get WIRED\'s best '
+                'stories in your inbox.</p><form><input type="email"><button>Sign up'
+                "</button></form></div>\n"
+            )
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8">\
+<title>{title} | WIRED</title>
+<link rel="canonical" href="https://www.wired.com/story/{slug(title)}/">
+{script_blob(rng)}<script type="application/ld+json">\
+{{"@type":"NewsArticle","headline":"{title}"}}</script></head>
+<body><div class="page"><div class="promo-banner">Get WIRED for just $5 a year</div>
+<header class="header-navigation">{nav(rng, "navigation__list")}\
+<button class="search-button">Search</button>\
+<a class="account" href="/account">Sign In</a></header>
+<main><article class="article main-content" lang="en-US">
+<header class="ContentHeaderWrapper"><div class="rubric">\
+<a href="/category/science">Science</a></div>\
+<h1 data-testid="ContentHeaderHed">{title}</h1>
+<div class="ContentHeaderDek">Recovering materials is getting easier, but the \
+economics remain shaky.</div>
+<div class="BylinesWrapper"><span>Casey Rivera</span><time>Oct 14, 2025 6:00 AM</time>\
+</div>{share("social-icons")}</header>
+<div class="body body__container article__body"><div class="body__inner-container">
+{body}</div></div>
+<div class="content-tags"><a href="/tag/energy">energy</a> <a href="/tag/cars">cars</a>\
+</div>
+</article>
+<div class="recirc-list">{related_list(rng, "summary-list")}</div>
+<div class="most-popular"><h2>Most Popular</h2>\
+{related_list(rng, "most-popular-list")}</div>
+</main>{trending(rng)}{footer()}</div></body></html>"""
+
+
+def techcrunch(rng: random.Random, title: str, paras: list[str]) -> str:
+    body = "".join(f'<p class="wp-block-paragraph">{p}</p>\n' for p in paras[:2])
+    body += (
+        '<figure class="wp-block-image size-large"><img src="/inline.jpg">'
+        '<figcaption class="wp-element-caption"><strong>Image Credits:</strong>'
+        "Company</figcaption></figure>\n"
+    )
+    body += "".join(f'<p class="wp-block-paragraph">{p}</p>\n' for p in paras[2:])
+    return f"""<!DOCTYPE html><html lang="en-US"><head><meta charset="UTF-8">\
+<title>{title} | TechCrunch</title>
+<link rel="canonical" href="https://techcrunch.com/2025/10/14/{slug(title)}/">
+{script_blob(rng)}<script src="https://www.googletagmanager.com/gtm.js"></script></head>
+<body class="post-template-default single"><div class="wp-site-blocks">
+<header class="wp-block-template-part site-header">{nav(rng, "wp-block-navigation")}\
+<div class="event-banner"><a href="/events">TechCrunch Disrupt 2025: save up to $600 \
+on passes</a></div></header>
+<main class="wp-block-group"><div class="wp-block-columns">
+<div class="wp-block-column article-main">
+<div class="article-hero"><a class="tag" href="/category/startups/">Startups</a>\
+<h1 class="wp-block-post-title">{title}</h1>
+<div class="wp-block-tc23-author-card-name"><a href="/author/sam">Sam Patel</a></div>\
+<time datetime="2025-10-14T09:00:00">9:00 AM PDT · October 14, 2025</time>\
+{share("share-icons")}</div>
+<figure class="wp-block-post-featured-image"><img src="/hero.jpg"></figure>
+<div class="entry-content wp-block-post-content is-layout-constrained">
+{body}</div>
+<div class="wp-block-tc23-post-relevant-terms"><h3>Topics</h3>\
+<a href="/tag/funding">Fundraising</a> <a href="/tag/devtools">Developer tools</a></div>
+<div class="wp-block-techcrunch-inline-cta"><h3>Newsletters</h3><p>Subscribe for the \
+industry's biggest tech news</p><form><input type="email"><button>Subscribe</button>\
+</form></div>
+</div>
+<div class="wp-block-column sidebar">{related_list(rng, "wp-block-tc23-most-popular")}\
+<div class="ad-unit">Advertisement</div></div>
+</div>
+<div class="related-posts">{related_list(rng, "wp-block-query")}</div></main>
+{trending(rng)}{footer()}</div></body></html>"""
+
+
+TEMPLATES = {
+    "guardian": guardian,
+    "nytimes": nytimes,
+    "wired": wired,
+    "techcrunch": techcrunch,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--out", default=DEFAULT_CORPUS, help="Directory with the <name>.txt goldens"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(SEED)
+    for name, title in TITLES.items():
+        paras = read_golden(os.path.join(args.out, f"{name}.txt"))
+        html = TEMPLATES[name.split("-")[0]](rng, title, paras)
+        with open(os.path.join(args.out, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"Wrote {name}.html")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
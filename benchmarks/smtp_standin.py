@@ -0,0 +1,194 @@
+"""
+Local stand-in SMTP server for exercising NewsletterSender without a real mail server
+
+Accepts any AUTH, stores nothing and counts the messages it receives. It can
+add per-message latency (to mimic a remote server's round trips), drop
+connections every N messages (to exercise reconnects) and turn away sessions
+beyond a concurrency limit with 421, like a relay that caps connections.
+
+Usage (from the repository root):
+  python benchmarks/smtp_standin.py [--port 1025] [--latency S] [--drop-every N]
+                                    [--max-sessions N]
+
+then send with:
+  SMTP_SERVER=127.0.0.1 SMTP_PORT=1025 SMTP_STARTTLS=false \\
+  SENDER_EMAIL=me@example.com SENDER_PASSWORD=x python src/newsletter_cli.py send
+"""
+
+import argparse
+import socketserver
+import threading
+import time
+from typing import Optional
+
+
+class StandInSMTPServer(socketserver.ThreadingTCPServer):
+    """Threaded SMTP stand-in; `start()` serves in the background"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        drop_every: int = 0,
+        max_sessions: int = 0,
+    ):
+        super().__init__((host, port), SMTPHandler)
+        self.latency = latency
+        self.drop_every = drop_every
+        self.max_sessions = max_sessions
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.bytes = 0
+        self.connections = 0
+        self.drops = 0
+        self.sessions = 0
+        self.refused = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "StandInSMTPServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def record(self, size: int) -> bool:
+        """Count a received message; returns whether to drop the connection now"""
+        with self.lock:
+            self.messages += 1
+            self.bytes += size
+            drop = bool(self.drop_every) and self.messages % self.drop_every == 0
+            self.drops += drop
+            return drop
+
+    def open_session(self) -> bool:
+        """Count a new connection; returns whether it is within max_sessions"""
+        with self.lock:
+            if self.max_sessions and self.sessions >= self.max_sessions:
+                self.refused += 1
+                return False
+            self.connections += 1
+            self.sessions += 1
+            return True
+
+    def close_session(self) -> None:
+        with self.lock:
+            self.sessions -= 1
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        server: StandInSMTPServer = self.server
+        if not server.open_session():
+            self.reply("421 4.7.0 Too many concurrent sessions")
+            return
+        self.open = True
+        try:
+            self.session(server)
+        finally:
+            self.end_session(server)
+
+    def end_session(self, server: StandInSMTPServer) -> None:
+        if self.open:
+            self.open = False
+            server.close_session()
+
+    def session(self, server: StandInSMTPServer) -> None:
+        self.reply("220 stand-in ESMTP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-stand-in")
+                self.reply("250-8BITMIME")
+                self.reply("250 AUTH PLAIN LOGIN")
+            elif verb == "HELO":
+                self.reply("250 stand-in")
+            elif verb == "AUTH":
+                parts = command.split()
+                if len(parts) == 2:
+                    # Mechanism without an initial response: one or two challenges
+                    prompts = 2 if parts[1].upper() == "LOGIN" else 1
+                    for _ in range(prompts):
+                        self.reply("334 ")
+                        self.rfile.readline()
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data == b".\r\n":
+                        break
+                    size += len(data)
+                if server.latency:
+                    time.sleep(server.latency)
+                if server.record(size):
+                    # Hang up without a reply, like a server that went away
+                    return
+                self.reply("250 2.0.0 Ok: queued")
+            elif verb == "QUIT":
+                # Free the slot before the client sees 221 and reconnects
+                self.end_session(server)
+                self.reply("221 Bye")
+                return
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 Ok")
+            else:
+                self.reply("502 Command not implemented")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in SMTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds to wait per message"
+    )
+    parser.add_argument(
+        "--drop-every", type=int, default=0, help="Hang up after every Nth message"
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=0,
+        help="Refuse connections beyond this many at once with 421",
+    )
+    args = parser.parse_args()
+
+    server = StandInSMTPServer(
+        args.host, args.port, args.latency, args.drop_every, args.max_sessions
+    )
+    print(f"Stand-in SMTP server on {args.host}:{server.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(
+            f"Received {server.messages} messages ({server.bytes} bytes) over "
+            f"{server.connections} connections, {server.drops} dropped, "
+            f"{server.refused} refused"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,403 @@
+"""
+Embedded article store - one SQLite database shared by the scraper, fact extraction
+and the newsletter builder
+
+Usage:
+  python src/article_store.py export [--scraped FILE] [--facts FILE] [--days N]
+  python src/article_store.py stats
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import textwrap
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+
+from article_stream import JsonlArticleWriter, is_jsonl
+from ranking import parse_published
+from seen_index import canonicalize_url
+
+# Stage status of an article, in pipeline order
+NEW = "new"
+SCRAPED = "scraped"
+FAILED = "failed"
+DUPLICATE = "duplicate"
+EXTRACTED = "extracted"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    canonical_url TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    title TEXT,
+    category TEXT,
+    published TEXT,
+    published_at REAL NOT NULL,
+    summary TEXT,
+    content TEXT,
+    fact TEXT,
+    status TEXT NOT NULL DEFAULT 'new',
+    score REAL,
+    added_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_status ON articles (status, published_at);
+CREATE INDEX IF NOT EXISTS articles_published_at ON articles (published_at);
+CREATE INDEX IF NOT EXISTS articles_score ON articles (score);
+"""
+
+# Rows whose content is already in the store
+HAS_CONTENT = (SCRAPED, EXTRACTED)
+# Largest number of host parameters bound in one IN (...) query
+CHUNK = 500
+
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def _chunks(items: List, size: int = CHUNK) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class ArticleStore:
+    """Articles and their structured facts, keyed by canonical URL.
+
+    Each article row moves through the stage statuses new -> scraped ->
+    extracted (or failed / duplicate), and stages query only the rows they
+    need through the indexes on status, publish date and score rather than
+    re-parsing whole JSON files. The database runs in WAL mode, so the
+    builder can read while a scrape is writing.
+
+    Rows come back as plain article dicts (title, link, Category, published,
+    summary, content) and fact dicts, the same shape as the legacy
+    scraped_content.json and structured_facts.jsonl records; `export` writes
+    those files from the store.
+    """
+
+    def __init__(self, db_file: Optional[str] = None):
+        self.db_file = db_file or os.getenv("ARTICLE_DB", "output/articles.db")
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ArticleStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _row_values(article: dict, now: float) -> Tuple:
+        published_at = parse_published(article.get("published"))
+        return (
+            canonicalize_url(article["link"]),
+            article["link"],
+            article.get("title"),
+            _dumps(article.get("Category") or []),
+            article.get("published"),
+            now if published_at != published_at else published_at,
+            article.get("summary"),
+            now,
+            now,
+        )
+
+    def add_articles(self, articles: Iterable[dict]) -> int:
+        """Record newly discovered articles; ones already stored are left as
+        they are. Returns the number added."""
+        now = time.time()
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (canonical_url, link, title, category,"
+                " published, published_at, summary, added_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row_values(article, now) for article in articles),
+            )
+            return self.conn.total_changes - before
+
+    def _upsert(self, article: dict, status: str, content: Optional[str]) -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO articles (canonical_url, link, title, category, published,"
+                " published_at, summary, added_at, updated_at, status, content)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (canonical_url) DO UPDATE SET"
+                " status = excluded.status, content = excluded.content,"
+                " updated_at = excluded.updated_at",
+                (*self._row_values(article, now), status, content),
+            )
+
+    def save_content(self, article: dict) -> None:
+        """Store a scraped article (an article dict with its "content")"""
+        self._upsert(article, SCRAPED, article["content"])
+
+    def mark_failed(self, article: dict) -> None:
+        """Record a failed scrape; failed articles are retried by later runs"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO articles (canonical_url, link, title, category,"
+                " published, published_at, summary, added_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._row_values(article, now),
+            )
+            self.conn.execute(
+                "UPDATE articles SET status = ?, updated_at = ?"
+                " WHERE canonical_url = ? AND status IN (?, ?)",
+                (FAILED, now, canonicalize_url(article["link"]), NEW, FAILED),
+            )
+
+    def mark_duplicates(self, links: Iterable[str]) -> None:
+        """Keep near-duplicate stories out of fact extraction and the newsletter"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET status = ?, updated_at = ? WHERE canonical_url = ?",
+                ((DUPLICATE, now, canonicalize_url(link)) for link in links),
+            )
+
+    def save_fact(self, fact: dict) -> None:
+        """Store the structured fact of an article (keyed by its original_article link)"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE articles SET fact = ?, status = ?, updated_at = ?"
+                " WHERE canonical_url = ?",
+                (
+                    _dumps(fact),
+                    EXTRACTED,
+                    time.time(),
+                    canonicalize_url(fact["original_article"]["link"]),
+                ),
+            )
+
+    def set_scores(self, scores: Iterable[Tuple[str, float]]) -> None:
+        """Record (link, ranking score) pairs"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET score = ? WHERE canonical_url = ?",
+                ((float(score), canonicalize_url(link)) for link, score in scores),
+            )
+
+    def statuses(self, links: Iterable[str]) -> Dict[str, str]:
+        """Map the canonical URL of each stored link to its status"""
+        keys = list({canonicalize_url(link) for link in links})
+        found = {}
+        for chunk in _chunks(keys):
+            rows = self.conn.execute(
+                "SELECT canonical_url, status FROM articles WHERE canonical_url IN"
+                f" ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(rows.fetchall())
+        return found
+
+    def links(self, *statuses: str) -> List[str]:
+        """Canonical URLs of the articles in any of `statuses`"""
+        rows = self.conn.execute(
+            "SELECT canonical_url FROM articles WHERE status IN"
+            f" ({', '.join('?' * len(statuses))})",
+            statuses,
+        )
+        return [url for (url,) in rows]
+
+    @staticmethod
+    def _article(row: sqlite3.Row, with_content: bool) -> dict:
+        article = {
+            "title": row["title"],
+            "link": row["link"],
+            "Category": orjson.loads(row["category"]) if row["category"] else [],
+            "published": row["published"],
+            "summary": row["summary"],
+        }
+        if with_content and row["content"] is not None:
+            article["content"] = row["content"]
+        return article
+
+    def _query(
+        self, columns: str, statuses: Tuple[str, ...], since: Optional[float]
+    ) -> sqlite3.Cursor:
+        where = [f"status IN ({', '.join('?' * len(statuses))})"]
+        params: List = list(statuses)
+        if since is not None:
+            where.append("published_at >= ?")
+            params.append(since)
+        return self.conn.execute(
+            f"SELECT {columns} FROM articles WHERE {' AND '.join(where)}"
+            " ORDER BY published_at DESC",
+            params,
+        )
+
+    def iter_articles(
+        self,
+        *statuses: str,
+        since: Optional[float] = None,
+        with_content: bool = True,
+    ) -> Iterator[dict]:
+        """Lazily yield the articles in any of `statuses` (by default, all with
+        content) published at or after `since`, newest first"""
+        columns = "title, link, category, published, summary"
+        if with_content:
+            columns += ", content"
+        cursor = self._query(columns, statuses or HAS_CONTENT, since)
+        for row in cursor:
+            yield self._article(row, with_content)
+
+    def iter_facts(self, since: Optional[float] = None) -> Iterator[dict]:
+        """Lazily yield the structured facts of articles published at or after `since`"""
+        for (fact,) in self._query("fact", (EXTRACTED,), since):
+            yield orjson.loads(fact)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of articles per status"""
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) FROM articles GROUP BY status"
+        )
+        return dict(rows.fetchall())
+
+    def content_writer(self) -> "StoreWriter":
+        return StoreWriter(self, self.save_content, (SCRAPED, DUPLICATE, EXTRACTED))
+
+    def fact_writer(self) -> "StoreWriter":
+        return StoreWriter(self, self.save_fact, (EXTRACTED,))
+
+    def export(
+        self,
+        scraped_file: Optional[str] = None,
+        facts_file: Optional[str] = None,
+        since: Optional[float] = None,
+    ) -> Tuple[int, int]:
+        """Write the legacy scraped-content and structured-facts files (.json
+        lists or .jsonl); returns the number of articles and facts written"""
+        articles = facts = 0
+        if scraped_file:
+            articles = _write_records(scraped_file, self.iter_articles(since=since))
+        if facts_file:
+            facts = _write_records(facts_file, self.iter_facts(since=since))
+        return articles, facts
+
+
+class StoreWriter:
+    """Saves records into an ArticleStore through the same interface as
+    JsonlArticleWriter, so the scrapers and fact extraction stream to either.
+
+    `filter_done` drops articles whose row already has one of `done_statuses`.
+    """
+
+    def __init__(
+        self,
+        store: ArticleStore,
+        save: Callable[[dict], None],
+        done_statuses: Tuple[str, ...],
+    ):
+        self.store = store
+        self.path = store.db_file
+        self.save = save
+        self.done_statuses = done_statuses
+        self.written = 0
+
+    def filter_done(self, articles: Iterable[dict]) -> List[dict]:
+        articles = list(articles)
+        statuses = self.store.statuses(a["link"] for a in articles)
+        return [
+            a
+            for a in articles
+            if statuses.get(canonicalize_url(a["link"])) not in self.done_statuses
+        ]
+
+    def open(self) -> "StoreWriter":
+        return self
+
+    def write(self, record: dict) -> None:
+        self.save(record)
+        self.written += 1
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _write_records(path: str, records: Iterable[dict]) -> int:
+    """Stream `records` to a .jsonl file, or to a JSON list file (indented
+    like the scraper's output) without building the list in memory"""
+    if is_jsonl(path):
+        if os.path.exists(path):
+            os.remove(path)
+        with JsonlArticleWriter(path, flush_every=1000) as writer:
+            for record in records:
+                writer.write(record)
+        return writer.written
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    count = 0
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(
+                textwrap.indent(json.dumps(record, ensure_ascii=False, indent=4), "    ")
+            )
+            count += 1
+        f.write("\n]" if count else "]")
+    os.replace(tmp_file, path)
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Article store tools")
+    parser.add_argument("--db", default=os.getenv("ARTICLE_DB", "output/articles.db"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser(
+        "export", help="Write the legacy scraped-content and structured-facts files"
+    )
+    export.add_argument(
+        "--scraped", default=os.getenv("SCRAPER_OUTPUT", "output/scraped_content.json")
+    )
+    export.add_argument(
+        "--facts", default=os.getenv("FACTS_OUTPUT", "output/structured_facts.jsonl")
+    )
+    export.add_argument(
+        "--days", type=float, help="Only articles published in the last N days"
+    )
+
+    commands.add_parser("stats", help="Show article counts per stage")
+
+    args = parser.parse_args()
+    with ArticleStore(args.db) as store:
+        if args.command == "stats":
+            counts = store.counts()
+            print(f"Articles: {sum(counts.values())}")
+            for status in (NEW, SCRAPED, FAILED, DUPLICATE, EXTRACTED):
+                print(f"  {status}: {counts.get(status, 0)}")
+            return 0
+
+        since = time.time() - args.days * 86400 if args.days is not None else None
+        articles, facts = store.export(args.scraped, args.facts, since)
+        print(f"Exported {articles} articles to {args.scraped}")
+        print(f"Exported {facts} facts to {args.facts}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
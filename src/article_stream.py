@@ -0,0 +1,152 @@
+"""
+Streaming JSON Lines storage for scraped articles
+"""
+
+import json
+import os
+import time
+from typing import Iterable, Iterator, List, Set
+
+import jsonlines
+import orjson
+
+from seen_index import canonicalize_url
+
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def iter_jsonl_articles(path: str) -> Iterator[dict]:
+    """Lazily yield articles from a JSON Lines file.
+
+    A truncated last line (the process died mid-write) is skipped.
+    """
+    with jsonlines.open(path, loads=orjson.loads) as reader:
+        yield from reader.iter(type=dict, skip_invalid=True, skip_empty=True)
+
+
+def is_jsonl(path: str) -> bool:
+    return path.endswith(".jsonl")
+
+
+def iter_json_records(path: str) -> Iterator[dict]:
+    """Yield the records of a JSON list file, or lazily of a JSON Lines file.
+
+    Raises FileNotFoundError if the file is missing.
+    """
+    if is_jsonl(path):
+        yield from iter_jsonl_articles(path)
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    yield from data if isinstance(data, list) else []
+
+
+def merge_json_articles(path: str, articles: Iterable[dict]) -> int:
+    """Add scraped `articles` to the JSON list file at `path`.
+
+    Articles without content are ignored, and an article already in the file
+    (same canonical URL) is replaced by its newer copy. The file is left alone
+    when there is nothing to add, so a poll that found nothing new keeps the
+    previous articles. Returns the number of articles added or replaced.
+    """
+    scraped = [a for a in articles if a.get("content")]
+    if not scraped:
+        return 0
+    try:
+        existing = list(iter_json_records(path))
+    except FileNotFoundError:
+        existing = []
+    merged = {canonicalize_url(a["link"]): a for a in existing if a.get("link")}
+    for article in scraped:
+        merged[canonicalize_url(article["link"])] = article
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(list(merged.values()), f, ensure_ascii=False, indent=4)
+    os.replace(tmp_file, path)
+    return len(scraped)
+
+
+class JsonlArticleWriter:
+    """Appends one JSON Lines record per finished article.
+
+    Records are flushed every `flush_every` articles or `flush_interval`
+    seconds, whichever comes first, so a crash loses at most that much work.
+    `done_urls` lists the canonical URLs already in the file, which lets a
+    restarted scrape skip them.
+    """
+
+    def __init__(
+        self,
+        path: str = "output/scraped_content.jsonl",
+        flush_every: int = 10,
+        flush_interval: float = 5.0,
+    ):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._writer = None
+
+    def done_urls(self) -> Set[str]:
+        """Canonical URLs of the articles already in the output file"""
+        if not os.path.exists(self.path):
+            return set()
+        return {
+            canonicalize_url(article["link"])
+            for article in iter_jsonl_articles(self.path)
+            if article.get("link")
+        }
+
+    def filter_done(self, articles: Iterable[dict]) -> List[dict]:
+        """Drop articles already written by an earlier (possibly interrupted) run"""
+        done = self.done_urls()
+        return [a for a in articles if canonicalize_url(a["link"]) not in done]
+
+    def open(self) -> "JsonlArticleWriter":
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        # A crash mid-write can leave a partial last line; start on a fresh one
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+        self._writer = jsonlines.Writer(self._file, dumps=_dumps)
+        return self
+
+    def write(self, article: dict) -> None:
+        self._writer.write(article)
+        self.written += 1
+        self._pending += 1
+        if (
+            self._pending >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file:
+            self.flush()
+            self._writer.close()
+            self._file.close()
+            self._file = self._writer = None
+
+    def __enter__(self) -> "JsonlArticleWriter":
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
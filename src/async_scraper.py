@@ -0,0 +1,336 @@
+"""
+Async Playwright scraper - scrapes articles concurrently over a pool of browser pages,
+trying a plain HTTP fetch first where that is known to work
+"""
+
+import asyncio
+import traceback
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
+from playwright.async_api import async_playwright
+
+from article_store import ArticleStore
+from article_stream import JsonlArticleWriter, is_jsonl, merge_json_articles
+from extract_pool import ExtractionPool
+from extractor import ContentExtractor
+from fetch_tiers import BROWSER, HTTP, DomainTierMemory, is_js_gated
+from resource_blocking import ResourcePolicy, install_resource_blocking
+from seen_index import SeenIndex, find_canonical_link
+from selector_profiles import SelectorProfiles
+from snapshots import SnapshotStore
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+
+
+class AsyncScraper(ContentExtractor):
+    """Headless scraper that processes up to `concurrency` articles at once.
+
+    Each article is first fetched with a pooled plain-HTTP GET and run through
+    the density-based pipeline (see ContentExtractor). It is escalated to the
+    browser only when that yields fewer than `min_words` words or looks
+    JS-gated. The tier that worked is remembered per domain (DomainTierMemory),
+    so later runs go straight to the browser for sites that need it.
+
+    The browser is launched on first use: one Chromium instance shared by a
+    pool of isolated contexts, each owning a single page. An article borrows a
+    page from the pool for its navigation and returns it afterwards. Unless
+    `block_resources` is False, each context routes its requests through a
+    ResourcePolicy (config/resource_blocking.yaml) so images, fonts, media and
+    ad/analytics hosts are never downloaded.
+
+    Extraction runs in an ExtractionPool of `extract_workers` processes, so
+    parsing uses every core while the event loop keeps driving fetches. It
+    first tries the content selector learned for the article's domain
+    (SelectorProfiles) and runs the full density walk only on a miss. At most
+    `max_pending` articles (default twice the workers) are being fetched or
+    waiting for extraction at once, so when parsing falls behind, fetching
+    waits instead of holding the HTML of the whole batch in memory.
+
+    The HTML each article was extracted from is kept in a SnapshotStore
+    (output/snapshots) so extraction can be re-tuned offline with
+    `python src/snapshots.py re-extract`.
+
+    If `output_file` ends in .jsonl, each article is appended to it as soon as
+    it is scraped (see JsonlArticleWriter) and articles already in that file
+    are skipped, so an interrupted run resumes where it stopped. Otherwise
+    the new articles are merged into the JSON file at the end (see
+    merge_json_articles). With a `store`, articles are saved to the
+    ArticleStore the same way (and failures recorded) instead of to a file.
+
+    Usage:
+        async with AsyncScraper(concurrency=8) as scraper:
+            await scraper.scrape(articles)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        headless: bool = True,
+        seen_index: Optional[SeenIndex] = None,
+        navigation_timeout: float = 30.0,
+        output_file: str = "output/scraped_content.json",
+        min_words: int = 150,
+        tier_memory: Optional[DomainTierMemory] = None,
+        block_resources: bool = True,
+        resource_policy: Optional[ResourcePolicy] = None,
+        snapshot_store: Optional[SnapshotStore] = None,
+        keep_snapshots: bool = True,
+        selector_profiles: Optional[SelectorProfiles] = None,
+        extract_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        store: Optional[ArticleStore] = None,
+    ) -> None:
+        super().__init__()
+        self.concurrency = concurrency
+        self.headless = headless
+        self.seen_index = seen_index if seen_index is not None else SeenIndex()
+        self.navigation_timeout = navigation_timeout
+        self.output_file = output_file
+        self.store = store
+        self._writer: Optional[JsonlArticleWriter] = None
+        self.min_words = min_words
+        self.tier_memory = tier_memory or DomainTierMemory()
+        self.resource_policy = (
+            (resource_policy or ResourcePolicy.from_config()) if block_resources else None
+        )
+        self.resource_stats = {}
+        self.selector_profiles = (
+            selector_profiles if selector_profiles is not None else SelectorProfiles()
+        )
+        self.snapshot_store = (
+            (snapshot_store or SnapshotStore()) if keep_snapshots else None
+        )
+        self.bytes_saved = 0
+        self.extract_workers = extract_workers
+        self.extraction_pool = None
+        self.max_pending = max_pending
+        self._pending_slots = None
+        self.http = None
+        self.pw = None
+        self.browser = None
+        self.contexts = []
+        self.pages: asyncio.Queue = asyncio.Queue()
+        self._browser_lock = asyncio.Lock()
+        self._http_slots = asyncio.Semaphore(concurrency * 2)
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client and the extraction pool (the browser is
+        launched on first use)"""
+        self.extraction_pool = ExtractionPool(self, self.extract_workers)
+        self._pending_slots = asyncio.Semaphore(
+            self.max_pending or 2 * self.extraction_pool.workers
+        )
+        self.http = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=self.navigation_timeout,
+            limits=httpx.Limits(max_connections=self.concurrency * 2),
+            follow_redirects=True,
+        )
+
+    async def _ensure_browser(self) -> None:
+        """Launch the browser and fill the page pool, once"""
+        async with self._browser_lock:
+            if self.browser is not None:
+                return
+            self.pw = await async_playwright().start()
+            self.browser = await self.pw.chromium.launch(headless=self.headless)
+            for _ in range(self.concurrency):
+                context = await self.browser.new_context(user_agent=USER_AGENT)
+                context.set_default_navigation_timeout(self.navigation_timeout * 1000)
+                if self.resource_policy:
+                    self.resource_stats[context] = await install_resource_blocking(
+                        context, self.resource_policy
+                    )
+                self.contexts.append(context)
+                self.pages.put_nowait(await context.new_page())
+
+    async def close(self) -> None:
+        if self.http:
+            await self.http.aclose()
+            self.http = None
+        if self.extraction_pool:
+            self.extraction_pool.close()
+            self.extraction_pool = None
+        for context in self.contexts:
+            await context.close()
+        self.contexts = []
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.pw:
+            await self.pw.stop()
+            self.pw = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _fetch_http(self, url: str) -> str:
+        """Fetch `url` with a plain GET and return its HTML"""
+        async with self._http_slots:
+            response = await self.http.get(url)
+        response.raise_for_status()
+        return response.text
+
+    async def _fetch(self, url: str) -> str:
+        """Navigate a pooled page to `url` and return its HTML"""
+        await self._ensure_browser()
+        page = await self.pages.get()
+        stats = self.resource_stats.get(page.context)
+        try:
+            if stats:
+                stats.reset()
+            await page.goto(url, wait_until="domcontentloaded")
+            page_content = await page.content()
+            if stats:
+                self.bytes_saved += stats.estimated_bytes_saved
+                print(f"Resources for {url}: {stats.summary()}")
+            return page_content
+        finally:
+            if page.is_closed():
+                # The page crashed; replace it so the pool keeps its size
+                page = await page.context.new_page()
+            self.pages.put_nowait(page)
+
+    async def _fetch_and_extract(self, url: str, tier: str) -> Tuple[str, str]:
+        """Fetch `url` on `tier` and return (page HTML, extracted text)"""
+        # A slot covers the fetch too: taking it only after fetching would
+        # leave every other task free to fetch while extraction lags behind
+        async with self._pending_slots:
+            if tier == HTTP:
+                page_content = await self._fetch_http(url)
+            else:
+                page_content = await self._fetch(url)
+            # Extraction is CPU-bound; run it in a worker process
+            extracted_text, selector, hit = await asyncio.wrap_future(
+                self.extraction_pool.submit(
+                    page_content, self.selector_profiles.selector_for(url), 0.6
+                )
+            )
+        self.selector_profiles.record(url, selector, hit)
+        return page_content, extracted_text
+
+    async def _fetch_tiered(self, url: str) -> Tuple[str, str]:
+        """Try the HTTP tier (unless the domain needs a browser), then the browser"""
+        if self.tier_memory.tier_for(url) == HTTP:
+            try:
+                page_content, extracted_text = await self._fetch_and_extract(url, HTTP)
+                usable = len(extracted_text.split()) >= self.min_words and not (
+                    is_js_gated(extracted_text)
+                )
+            except Exception as e:
+                print(f"HTTP fetch failed for {url}: {e}")
+                usable = False
+            self.tier_memory.record(url, HTTP, usable)
+            if usable:
+                return page_content, extracted_text
+            print(f"Escalating {url} to the browser")
+
+        try:
+            result = await self._fetch_and_extract(url, BROWSER)
+        except Exception:
+            self.tier_memory.record(url, BROWSER, False)
+            raise
+        self.tier_memory.record(url, BROWSER, True)
+        return result
+
+    async def _scrape_one(self, index: int, article: dict) -> Optional[dict]:
+        """Scrape one article and return its output record: the article with
+        its content.
+
+        Returns None if scraping failed, if the article duplicates a seen
+        page, or if the record was streamed to the JSON Lines output or the
+        store (failures are not, so a resumed run retries them).
+        """
+        url = article["link"]
+        try:
+            page_content, extracted_text = await self._fetch_tiered(url)
+            if self.snapshot_store:
+                await asyncio.to_thread(self.snapshot_store.put, url, page_content)
+
+            canonical = find_canonical_link(page_content)
+            if canonical:
+                canonical = urljoin(url, canonical)
+                if canonical in self.seen_index:
+                    print(f"Duplicate of already-processed {canonical}, skipping")
+                    return None
+
+            record = {**article, "content": extracted_text}
+            print(
+                f"=== {url} === {len(extracted_text)} characters, "
+                f"{len(extracted_text.split())} words (success... {index + 1})"
+            )
+            self.seen_index.mark(url, canonical)
+        except Exception as e:
+            print(f"Error navigating to {url}: \n {e} {traceback.format_exc()}\n")
+            print("Failed...", index + 1)
+            if self.store is not None:
+                self.store.mark_failed(article)
+            return None
+
+        if self._writer:
+            self._writer.write(record)
+            return None
+        return record
+
+    async def scrape(self, articles: List[dict]) -> bool:
+        """Scrape all new articles concurrently and write them to the output file"""
+        if self.http is None:
+            await self.start()
+
+        total = len(articles)
+        articles = self.seen_index.filter_new(articles)
+        print(f"Skipping {total - len(articles)} already-processed articles")
+
+        if self.store is not None:
+            await self._scrape_streaming(articles, self.store.content_writer())
+        elif is_jsonl(self.output_file):
+            await self._scrape_streaming(articles, JsonlArticleWriter(self.output_file))
+        else:
+            records = await asyncio.gather(
+                *(self._scrape_one(i, article) for i, article in enumerate(articles))
+            )
+            merge_json_articles(self.output_file, filter(None, records))
+        self.seen_index.save()
+        self.tier_memory.save()
+        self.selector_profiles.save()
+        print(f"Learned selector hit rate: {self.selector_profiles.hit_rate():.0%}")
+        if self.resource_policy:
+            print(f"Resource blocking saved ~{self.bytes_saved / 1024 / 1024:.1f} MB")
+        return True
+
+    async def _scrape_streaming(self, articles: List[dict], writer) -> None:
+        """Scrape `articles`, handing each one to `writer` (the JSON Lines
+        output or the store) as it finishes"""
+        pending = len(articles)
+        articles = writer.filter_done(articles)
+        if len(articles) < pending:
+            print(
+                f"Resuming: {pending - len(articles)} articles already in "
+                f"{writer.path}"
+            )
+
+        with writer:
+            self._writer = writer
+            try:
+                await asyncio.gather(
+                    *(self._scrape_one(i, article) for i, article in enumerate(articles))
+                )
+            finally:
+                self._writer = None
+        print(f"Streamed {writer.written} articles to {writer.path}")
+
+
+def scrape_articles(articles: List[dict], **kwargs) -> bool:
+    """Synchronous entry point: scrape `articles` with a temporary AsyncScraper"""
+
+    async def run() -> bool:
+        async with AsyncScraper(**kwargs) as scraper:
+            return await scraper.scrape(articles)
+
+    return asyncio.run(run())
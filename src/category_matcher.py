@@ -0,0 +1,149 @@
+"""
+Category matcher - case-insensitive, alias-aware filtering of feed entries
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+TOKEN_RE = re.compile(r"\w+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased word tokens"""
+    return TOKEN_RE.findall(text.casefold())
+
+
+class PhraseAutomaton:
+    """Aho-Corasick automaton over word tokens.
+
+    Patterns are token sequences, so every match is aligned on word boundaries
+    and a text is scanned in a single pass regardless of the number of patterns.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[Tuple[str, ...], str]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[Set[str]] = [set()]
+        self.vocabulary: Set[str] = set()
+
+        for tokens, label in phrases:
+            state = 0
+            for token in tokens:
+                self.vocabulary.add(token)
+                next_state = self.goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][token] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                state = next_state
+            self.output[state].add(label)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        pending = deque(self.goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for token, next_state in self.goto[state].items():
+                pending.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(token, 0)
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def search(self, tokens: Iterable[str]) -> Set[str]:
+        """Return the labels of all phrases occurring in the token stream"""
+        goto, fail, output, vocabulary = (
+            self.goto,
+            self.fail,
+            self.output,
+            self.vocabulary,
+        )
+        found: Set[str] = set()
+        state = 0
+        for token in tokens:
+            if token not in vocabulary:
+                # No phrase contains this token, so no match can span it
+                state = 0
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found |= output[state]
+        return found
+
+
+class CategoryMatcher:
+    """Matches feed entries against configured categories.
+
+    Tags are looked up in a dict keyed by their normalized form; title and
+    summary are scanned with a PhraseAutomaton. Build it once and reuse it for
+    every entry.
+    """
+
+    def __init__(
+        self,
+        categories: List[str],
+        aliases: Optional[Dict[str, List[str]]] = None,
+        tag_only: Iterable[str] = (),
+    ):
+        aliases = aliases or {}
+        tag_only = set(tag_only)
+        self.categories = list(dict.fromkeys(categories))
+        self.tag_lookup: Dict[str, str] = {}
+        phrases = []
+        for category in self.categories:
+            for phrase in [category, *aliases.get(category, [])]:
+                tokens = tuple(tokenize(phrase))
+                if not tokens:
+                    continue
+                self.tag_lookup[" ".join(tokens)] = category
+                if category not in tag_only:
+                    phrases.append((tokens, category))
+        self.automaton = PhraseAutomaton(phrases)
+
+    @classmethod
+    def from_config(cls, config_file: str = "config/categories.yaml"):
+        """Build a matcher from the categories YAML file"""
+        with open(config_file, "r") as f:
+            entries = yaml.safe_load(f)["categories"]
+
+        categories, aliases, tag_only = [], {}, []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            categories.append(entry["name"])
+            aliases[entry["name"]] = entry.get("aliases", [])
+            if not entry.get("match_text", True):
+                tag_only.append(entry["name"])
+        return cls(categories, aliases, tag_only)
+
+    def match_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Return the categories named by any of the tags"""
+        lookup = self.tag_lookup
+        found = set()
+        for tag in tags:
+            category = lookup.get(" ".join(tokenize(tag)))
+            if category:
+                found.add(category)
+        return found
+
+    def match_text(self, text: str) -> Set[str]:
+        """Return the categories mentioned in free text (HTML tags are ignored)"""
+        if "<" in text:
+            text = TAG_RE.sub(" ", text)
+        return self.automaton.search(tokenize(text))
+
+    def match(self, entry: dict) -> Set[str]:
+        """Return the categories matched by an entry's tags, falling back to its
+        title and summary when no tag matches"""
+        found = self.match_tags(entry.get("tags", []))
+        if found:
+            return found
+        return self.match_text(f"{entry.get('title', '')} {entry.get('summary', '')}")
@@ -0,0 +1,119 @@
+"""
+Concurrent RSS discovery - finds publisher RSS links over a shared pooled HTTP client
+"""
+
+import asyncio
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+# Tag names are case-insensitive: <head>, <HEAD> and <Head> are all the head
+HEAD_RE = re.compile(r"<head[\s>]", re.IGNORECASE)
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+}
+
+
+class RSSDiscovery:
+    """Discovers RSS feed links for many publishers concurrently.
+
+    All requests share one pooled httpx.AsyncClient. A global semaphore bounds the
+    number of requests in flight and a per-host semaphore stops a single publisher
+    from being hit by more than `per_host_limit` requests at once, so total wall time
+    is bounded by the slowest publisher rather than the sum of all of them.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        per_host_limit: int = 2,
+        timeout: float = 10.0,
+        headers: Optional[dict] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 5.0))
+        self.headers = headers or DEFAULT_HEADERS
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore guarding requests to the host of `url`"""
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    @staticmethod
+    def find_rss_link(html_content: str, base_url: str) -> Optional[str]:
+        """Return the RSS link declared in the page head, if any.
+
+        Only the <head> section is handed to the parser; the body of a publisher
+        front page is usually far larger and never contains the link we want.
+        """
+        head_end = HEAD_END_RE.search(html_content)
+        if head_end:
+            html_content = html_content[: head_end.end()]
+        soup = BeautifulSoup(html_content, "html.parser")
+        head = soup.find("head")
+        if not head:
+            return None
+        rss_link = head.find("link", type="application/rss+xml")
+        if rss_link and rss_link.has_attr("href"):
+            return urljoin(base_url, rss_link["href"])
+        return None
+
+    async def _discover_one(
+        self,
+        client: httpx.AsyncClient,
+        global_limit: asyncio.Semaphore,
+        publisher: str,
+    ) -> Optional[str]:
+        """Fetch one publisher page and extract its RSS link"""
+        try:
+            async with global_limit, self._host_semaphore(publisher):
+                response = await client.get(publisher)
+            if not HEAD_RE.search(response.text):
+                print(f"No head tag found for {publisher}")
+                return None
+            rss_link = self.find_rss_link(response.text, str(response.url))
+            if rss_link:
+                print(f"Found RSS link for {publisher}: {rss_link}")
+            else:
+                print(f"No RSS link found in head for {publisher}")
+            return rss_link
+        except Exception as e:
+            print(f"Error processing {publisher}: {e}")
+            return None
+
+    async def discover(self, publishers: List[str]) -> List[str]:
+        """Discover RSS links for all publishers, preserving publisher order"""
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=limits,
+            follow_redirects=True,
+        ) as client:
+            results = await asyncio.gather(
+                *(
+                    self._discover_one(client, global_limit, publisher)
+                    for publisher in publishers
+                )
+            )
+
+        # dict.fromkeys dedupes feeds shared by several publisher pages, keeping order
+        return list(dict.fromkeys(url for url in results if url))
+
+
+def discover_rss_urls(publishers: List[str], **kwargs) -> List[str]:
+    """Synchronous entry point for RSSDiscovery.discover"""
+    return asyncio.run(RSSDiscovery(**kwargs).discover(publishers))
@@ -2,14 +2,18 @@
 Email service module for sending newsletters via SMTP
 """
 
+import html
 import smtplib
 import json
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import re
+import sqlite3
 from datetime import datetime
-from typing import List, Optional
+from urllib.parse import quote
+from typing import Callable, Iterable, Iterator, List, Optional
 import logging
+from mime_factory import MessageFactory
+from smtp_pool import SMTPPool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,75 +29,256 @@ class EmailConfig:
         self.sender_email = os.getenv("SENDER_EMAIL")
         self.sender_password = os.getenv("SENDER_PASSWORD")
         self.sender_name = os.getenv("SENDER_NAME", "DSEC AI Newsletter")
+        self.use_starttls = os.getenv("SMTP_STARTTLS", "true").lower() not in (
+            "0",
+            "false",
+            "no",
+        )
+        self.timeout = float(os.getenv("SMTP_TIMEOUT", 30))
+        # Parallel SMTP connections, and messages sent on one before it is replaced
+        self.connections = int(os.getenv("SMTP_CONNECTIONS", 4))
+        self.messages_per_connection = int(os.getenv("SMTP_MESSAGES_PER_CONNECTION", 100))
+        # Per-recipient unsubscribe link; {email} is replaced with the address
+        self.unsubscribe_url = os.getenv("UNSUBSCRIBE_URL") or (
+            f"mailto:{self.sender_email}?subject=unsubscribe%20{{email}}"
+        )
 
         if not self.sender_email or not self.sender_password:
             logger.warning("SMTP credentials not configured in .env file")
 
 
-class SubscriberManager:
-    """Manages newsletter subscribers"""
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s.]+$")
+
+
+def normalize_email(email: str) -> str:
+    """Lookup key of an email address (surrounding whitespace and case ignored)"""
+    return email.strip().casefold()
+
 
-    def __init__(self, subscribers_file: str = "output/subscribers.json"):
+def is_valid_email(email: str) -> bool:
+    return bool(EMAIL_RE.match(email.strip()))
+
+
+class SubscriberManager:
+    """Manages newsletter subscribers in an SQLite database.
+
+    Subscribers are keyed by normalized email, so lookups are indexed and each
+    add or remove is a single transactional statement; a send and a CLI
+    change running at the same time cannot lose each other's writes. A legacy
+    `subscribers_file` (JSON) is imported the first time the database is
+    opened and left in place.
+    """
+
+    def __init__(
+        self,
+        subscribers_file: str = "output/subscribers.json",
+        db_file: Optional[str] = None,
+    ):
         self.subscribers_file = subscribers_file
-        self._ensure_file_exists()
+        self.db_file = db_file or os.getenv("SUBSCRIBERS_DB", "output/subscribers.db")
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS subscribers (
+                email_key TEXT NOT NULL UNIQUE,
+                email TEXT NOT NULL,
+                name TEXT NOT NULL DEFAULT '',
+                subscribed_at TEXT NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        self._migrate_json()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _migrate_json(self):
+        """Import the legacy JSON subscriber file, once"""
+        with self.conn:
+            if self.conn.execute("PRAGMA user_version").fetchone()[0] >= 1:
+                return
+            if os.path.exists(self.subscribers_file):
+                try:
+                    with open(self.subscribers_file, "r") as f:
+                        subscribers = json.load(f).get("subscribers", [])
+                except Exception as e:
+                    logger.error(f"Error loading {self.subscribers_file}: {e}")
+                    return
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO subscribers"
+                    " (email_key, email, name, subscribed_at, active)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (
+                            normalize_email(s["email"]),
+                            s["email"].strip(),
+                            s.get("name") or "",
+                            s.get("subscribed_at") or datetime.now().isoformat(),
+                            int(s.get("active", True)),
+                        )
+                        for s in subscribers
+                        if s.get("email")
+                    ),
+                )
+                logger.info(
+                    f"Migrated {self.conn.total_changes - before} subscribers "
+                    f"from {self.subscribers_file} to {self.db_file}"
+                )
+            self.conn.execute("PRAGMA user_version = 1")
+
+    @staticmethod
+    def _subscriber(row: sqlite3.Row) -> dict:
+        return {
+            "email": row["email"],
+            "name": row["name"],
+            "subscribed_at": row["subscribed_at"],
+            "active": bool(row["active"]),
+        }
 
-    def _ensure_file_exists(self):
-        """Create subscribers file if it doesn't exist"""
-        if not os.path.exists(self.subscribers_file):
-            with open(self.subscribers_file, "w") as f:
-                json.dump({"subscribers": []}, f, indent=2)
+    def iter_subscribers(
+        self, batch_size: int = 1000, include_inactive: bool = False
+    ) -> Iterator[dict]:
+        """Lazily yield active subscribers (or all of them), `batch_size` rows
+        per query, so the list is never held in memory and no read stays open
+        between batches"""
+        last = 0
+        active = (0, 1) if include_inactive else (1,)
+        while True:
+            rows = self.conn.execute(
+                "SELECT rowid, email, name, subscribed_at, active FROM subscribers"
+                f" WHERE rowid > ? AND active IN ({', '.join('?' * len(active))})"
+                " ORDER BY rowid LIMIT ?",
+                (last, *active, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1]["rowid"]
+            for row in rows:
+                yield self._subscriber(row)
 
     def load_subscribers(self) -> List[dict]:
         """Load all active subscribers"""
         try:
-            with open(self.subscribers_file, "r") as f:
-                data = json.load(f)
-                return [s for s in data.get("subscribers", []) if s.get("active", True)]
+            return list(self.iter_subscribers())
         except Exception as e:
             logger.error(f"Error loading subscribers: {e}")
             return []
 
+    def count(self) -> int:
+        """Number of active subscribers"""
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM subscribers WHERE active = 1"
+        ).fetchone()[0]
+
+    def get_subscriber(self, email: str) -> Optional[dict]:
+        """Look up a subscriber (active or not) by email"""
+        row = self.conn.execute(
+            "SELECT email, name, subscribed_at, active FROM subscribers"
+            " WHERE email_key = ?",
+            (normalize_email(email),),
+        ).fetchone()
+        return self._subscriber(row) if row else None
+
     def add_subscriber(self, email: str, name: str = "") -> bool:
-        """Add a new subscriber"""
+        """Add a new subscriber (or re-activate a removed one)"""
         try:
-            with open(self.subscribers_file, "r") as f:
-                data = json.load(f)
-
-            # Check if already subscribed
-            if any(s["email"] == email for s in data["subscribers"]):
+            with self.conn:
+                cursor = self.conn.execute(
+                    "INSERT INTO subscribers (email_key, email, name, subscribed_at)"
+                    " VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (email_key) DO UPDATE SET"
+                    " email = excluded.email, name = excluded.name,"
+                    " subscribed_at = excluded.subscribed_at, active = 1"
+                    " WHERE active = 0",
+                    (
+                        normalize_email(email),
+                        email.strip(),
+                        name,
+                        datetime.now().isoformat(),
+                    ),
+                )
+            if not cursor.rowcount:
                 logger.warning(f"Email {email} already subscribed")
                 return False
 
-            data["subscribers"].append(
-                {
-                    "email": email,
-                    "name": name,
-                    "subscribed_at": datetime.now().isoformat(),
-                    "active": True,
-                }
-            )
-
-            with open(self.subscribers_file, "w") as f:
-                json.dump(data, f, indent=2)
-
             logger.info(f"Added subscriber: {email}")
             return True
         except Exception as e:
             logger.error(f"Error adding subscriber: {e}")
             return False
 
+    def import_subscribers(
+        self,
+        records: Iterable[dict],
+        batch_size: int = 5000,
+        progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """Bulk-add subscribers from `records` (dicts with "email" and
+        optionally "name"), consumed lazily.
+
+        Each batch of `batch_size` records is validated and normalized, and
+        inserted in one transaction. Addresses already in the database,
+        removed ones included, are left untouched, as are repeats within the
+        input. `progress` is called with the running stats after each batch.
+        Returns the stats: read, added, duplicates, invalid and the first few
+        invalid addresses.
+        """
+        stats = {"read": 0, "added": 0, "duplicates": 0, "invalid": 0, "rejected": []}
+        now = datetime.now().isoformat()
+        batch = {}
+
+        def flush():
+            with self.conn:
+                before = self.conn.total_changes
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO subscribers"
+                    " (email_key, email, name, subscribed_at) VALUES (?, ?, ?, ?)",
+                    batch.values(),
+                )
+                added = self.conn.total_changes - before
+            stats["added"] += added
+            stats["duplicates"] += len(batch) - added
+            batch.clear()
+            if progress:
+                progress(stats)
+
+        for record in records:
+            stats["read"] += 1
+            email = (record.get("email") or "").strip()
+            if not is_valid_email(email):
+                stats["invalid"] += 1
+                if len(stats["rejected"]) < 5:
+                    stats["rejected"].append(email)
+                continue
+            key = normalize_email(email)
+            if key in batch:
+                stats["duplicates"] += 1
+                continue
+            batch[key] = (key, email, (record.get("name") or "").strip(), now)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+        return stats
+
     def remove_subscriber(self, email: str) -> bool:
         """Remove a subscriber"""
         try:
-            with open(self.subscribers_file, "r") as f:
-                data = json.load(f)
-
-            for subscriber in data["subscribers"]:
-                if subscriber["email"] == email:
-                    subscriber["active"] = False
-
-            with open(self.subscribers_file, "w") as f:
-                json.dump(data, f, indent=2)
+            with self.conn:
+                cursor = self.conn.execute(
+                    "UPDATE subscribers SET active = 0"
+                    " WHERE email_key = ? AND active = 1",
+                    (normalize_email(email),),
+                )
+            if not cursor.rowcount:
+                logger.warning(f"Email {email} is not subscribed")
+                return False
 
             logger.info(f"Removed subscriber: {email}")
             return True
@@ -103,17 +288,26 @@ class SubscriberManager:
 
 
 class NewsletterSender:
-    """Sends newsletter emails"""
+    """Sends newsletter emails over a pool of SMTP connections (see SMTPPool)"""
 
-    def __init__(self):
-        self.config = EmailConfig()
-        self.subscriber_manager = SubscriberManager()
+    def __init__(
+        self,
+        config: Optional[EmailConfig] = None,
+        subscriber_manager: Optional[SubscriberManager] = None,
+    ):
+        self.config = config or EmailConfig()
+        self.subscriber_manager = subscriber_manager or SubscriberManager()
 
     def _create_connection(self):
         """Create SMTP connection"""
         try:
-            server = smtplib.SMTP(self.config.smtp_server, self.config.smtp_port)
-            server.starttls()
+            server = smtplib.SMTP(
+                self.config.smtp_server,
+                self.config.smtp_port,
+                timeout=self.config.timeout,
+            )
+            if self.config.use_starttls:
+                server.starttls()
             if self.config.sender_email and self.config.sender_password:
                 server.login(self.config.sender_email, self.config.sender_password)
             return server
@@ -187,6 +381,28 @@ class NewsletterSender:
 
         return html_content
 
+    def unsubscribe_link(self, email: str) -> str:
+        """UNSUBSCRIBE_URL for `email`"""
+        return self.config.unsubscribe_url.replace("{email}", quote(email, safe="@"))
+
+    def create_message_factory(self, html_content: str) -> MessageFactory:
+        """Render the newsletter once; each recipient's message then only adds
+        its own headers and {unsubscribe_link}"""
+        return MessageFactory(
+            html_content,
+            subject=f"DSEC AI Newsletter - {datetime.now().strftime('%B %d, %Y')}",
+            from_header=f"{self.config.sender_name} <{self.config.sender_email}>",
+            tokens={
+                "{unsubscribe_link}": lambda email: html.escape(
+                    self.unsubscribe_link(email)
+                )
+            },
+            headers={
+                "List-Unsubscribe": lambda email: f"<{self.unsubscribe_link(email)}>"
+            },
+            msgid_domain=self.config.sender_email.rpartition("@")[2] or "localhost",
+        )
+
     def send_newsletter(
         self, articles: List[dict], test_email: Optional[str] = None
     ) -> dict:
@@ -208,57 +424,45 @@ class NewsletterSender:
                 "error": "SMTP credentials not configured",
             }
 
-        recipients = (
-            [test_email]
-            if test_email
-            else [s["email"] for s in self.subscriber_manager.load_subscribers()]
-        )
+        if test_email:
+            recipients = [test_email]
+            total = 1
+        else:
+            # Streamed from the subscriber database rather than loaded at once
+            total = self.subscriber_manager.count()
+            recipients = (
+                s["email"] for s in self.subscriber_manager.iter_subscribers()
+            )
 
-        if not recipients:
+        if not total:
             logger.warning("No recipients to send newsletter to")
             return {"success": 0, "failed": 0, "error": "No recipients"}
 
-        html_content = self.create_html_template(articles)
-        success_count = 0
-        failed_count = 0
+        messages = self.create_message_factory(self.create_html_template(articles))
+
+        def send_one(server: smtplib.SMTP, email: str) -> None:
+            server.sendmail(self.config.sender_email, [email], messages.render(email))
 
-        server = self._create_connection()
-        if not server:
+        pool = SMTPPool(
+            self._create_connection,
+            connections=min(self.config.connections, total),
+            max_messages=self.config.messages_per_connection,
+        )
+        sent = pool.send(recipients, send_one)
+        if not sent["connected"]:
             return {
                 "success": 0,
-                "failed": len(recipients),
+                "failed": total,
                 "error": "Failed to connect to SMTP",
             }
 
-        try:
-            for email in recipients:
-                try:
-                    msg = MIMEMultipart("alternative")
-                    msg["Subject"] = (
-                        f"DSEC AI Newsletter - {datetime.now().strftime('%B %d, %Y')}"
-                    )
-                    msg["From"] = (
-                        f"{self.config.sender_name} <{self.config.sender_email}>"
-                    )
-                    msg["To"] = email
-
-                    # Attach HTML
-                    msg.attach(MIMEText(html_content, "html"))
-
-                    server.send_message(msg)
-                    logger.info(f"Newsletter sent to {email}")
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to send to {email}: {e}")
-                    failed_count += 1
-        finally:
-            server.quit()
-
         result = {
-            "success": success_count,
-            "failed": failed_count,
-            "total": len(recipients),
+            "success": sent["success"],
+            "failed": sent["failed"],
+            "total": total,
             "timestamp": datetime.now().isoformat(),
+            "seconds": sent["seconds"],
+            "connections": sent["connections"],
         }
 
         logger.info(f"Newsletter sending complete: {result}")
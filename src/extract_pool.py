@@ -0,0 +1,78 @@
+"""
+Process pool for CPU-bound content extraction
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from extractor import ContentExtractor
+
+# (noise tags, blacklist words, max document size) of the caller's extractor
+Settings = Tuple[Tuple[str, ...], Tuple[str, ...], int]
+
+# The extractor of a worker process and the settings it was built with
+_worker_extractor: Optional[ContentExtractor] = None
+_worker_settings: Optional[Settings] = None
+
+
+def _extract(
+    settings: Settings, page_content: str, selector: Optional[str], threshold: float
+) -> Tuple[str, Optional[str], bool]:
+    global _worker_extractor, _worker_settings
+    if settings != _worker_settings:
+        noise_tags, blacklist_words, max_document_size = settings
+        _worker_extractor = ContentExtractor(max_document_size)
+        _worker_extractor.noise_tags = list(noise_tags)
+        _worker_extractor.blacklist_words = list(blacklist_words)
+        _worker_settings = settings
+    return _worker_extractor.extract_with_selector(page_content, selector, threshold)
+
+
+class ExtractionPool:
+    """Runs ContentExtractor.extract_with_selector in worker processes.
+
+    lxml parsing and the density walk hold the GIL, so threads cannot overlap
+    them with browser work; worker processes can, one page per core. Workers
+    use a plain ContentExtractor with the settings (noise tags, blacklist
+    words, size cap) of `extractor`, which itself need not be picklable. The
+    settings are read at each `submit` and sent with the task, so changes to
+    them on `extractor` apply to the next page; a worker rebuilds its
+    extractor only when they differ from the last task's.
+    Selector learning stays with the caller: workers only return
+    (text, selector, hit) for the caller to record.
+
+    Workers are started by a fork server (or spawned where there is none),
+    never forked from a process already running Playwright's threads.
+    """
+
+    def __init__(self, extractor: ContentExtractor, workers: Optional[int] = None):
+        self.extractor = extractor
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            ),
+        )
+
+    def settings(self) -> Settings:
+        return (
+            tuple(self.extractor.noise_tags),
+            tuple(self.extractor.blacklist_words),
+            self.extractor.max_document_size,
+        )
+
+    def submit(
+        self, page_content: str, selector: Optional[str] = None, threshold: float = 0.6
+    ) -> Future:
+        """Schedule one extraction; the future resolves to (text, selector, hit)"""
+        return self.executor.submit(
+            _extract, self.settings(), page_content, selector, threshold
+        )
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
@@ -0,0 +1,314 @@
+from lxml import etree, html
+import re
+from typing import Optional, Tuple
+
+
+class ContentExtractor:
+    """Density-based main-content extraction from raw page HTML.
+
+    Holds the noise tags and blacklist words used to clean a page and has no
+    browser state, so scrapers (sync or async) share it by inheritance.
+    """
+
+    def __init__(self, max_document_size: int = 2_000_000) -> None:
+        """
+        Args:
+            max_document_size: Pages longer than this many characters are
+                truncated before parsing, bounding the memory one page can take.
+        """
+        self.max_document_size = max_document_size
+        self.noise_tags = [
+            "script",
+            "style",
+            "noscript",
+            "header",
+            "footer",
+            "meta",
+            "link",
+            "aside",
+            "svg",
+            "img",
+            "nav",
+        ]
+        self.blacklist_words = [
+            "comment",
+            "footer",
+            "header",
+            "nav",
+            "sidebar",
+            "advert",
+            "ads",
+            "sponsor",
+            "related",
+            "popup",
+            "subscribe",
+            "share",
+            "widget",
+            "breadcrumb",
+            "cookie",
+            "consent",
+            "banner",
+            "tool",
+            "button",
+            "form",
+            "input",
+            "search",
+            "login",
+            "signup",
+            "cta",
+            "menu",
+            "social",
+            "follow",
+            "like",
+            "dislike",
+            "rating",
+            "review",
+            "feedback",
+            "poll",
+            "survey",
+            "tag",
+            "tags",
+            "category",
+            "categories",
+            "newsletter",
+            "archive",
+            "copyright",
+            "terms",
+            "privacy",
+            "policy",
+            "disclaimer",
+            "sitemap",
+            "faq",
+            "help",
+            "support",
+            "contact",
+        ]
+
+    @property
+    def blacklist_regex(self) -> re.Pattern:
+        """Class-name blacklist matcher, compiled once per blacklist_words value"""
+        key = tuple(self.blacklist_words)
+        if getattr(self, "_blacklist_key", None) != key:
+            pattern = (
+                r"(^|[\s_-])(" + "|".join(map(re.escape, key)) + r")(?=$|[\s_-])"
+            )
+            self._blacklist_regex = re.compile(pattern, re.IGNORECASE)
+            self._blacklist_key = key
+        return self._blacklist_regex
+
+    @staticmethod
+    def _text_words(text):
+        """Word summary of a text node: (words, starts with a word, ends with a word).
+
+        Summaries of adjacent pieces of text merge exactly (see _merge_words), so an
+        element's word count can be built from its children's without re-joining text.
+        """
+        if not text:
+            return None
+        return (len(text.split()), not text[0].isspace(), not text[-1].isspace())
+
+    @staticmethod
+    def _merge_words(left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+        # A word split across the boundary ("foo<b>bar</b>") counts once
+        joined = 1 if left[2] and right[1] else 0
+        return (left[0] + right[0] - joined, left[1], right[2])
+
+    def _element_words(self, element, words):
+        """Word summary of `element` from the cached summaries of its children"""
+        text_words, merge = self._text_words, self._merge_words
+        summary = text_words(element.text)
+        for child in element:
+            if isinstance(child, html.HtmlElement):
+                summary = merge(summary, words[child])
+            summary = merge(summary, text_words(child.tail))
+        return summary
+
+    def count_words_by_element(self, tree) -> dict:
+        """Annotate every element with its word summary in one bottom-up pass.
+
+        Word counts equal len(element.text_content().split()); comments and
+        processing instructions contribute only their tail text, as in text_content.
+        """
+        words = {}
+        # Reversed document order visits every child before its parent
+        for element in reversed(list(tree.iter(etree.Element))):
+            words[element] = self._element_words(element, words)
+        return words
+
+    def find_content_by_density(self, tree, threshold=0.6):
+        """Find the main content container by analyzing text density layer by layer.
+        The Thresold signifies the minimum ratio of text in a child element compared to its parent
+        to continue drilling down.
+
+        Word counts for the whole tree are computed once up front
+        (count_words_by_element); the walk then reads them instead of rebuilding
+        each subtree's text at every layer.
+
+        Args:
+            tree: lxml element tree (already cleaned of noise tags)
+            threshold: If no child has more than this % of parent's text, stop drilling down
+
+        Returns:
+            The element containing the main content
+        """
+        words = self.count_words_by_element(tree)
+        blacklist = self.blacklist_regex
+
+        def count_words(element):
+            summary = words.get(element)
+            return summary[0] if summary else 0
+
+        current = tree
+
+        while True:
+            children = list(current)
+
+            # If no children, we've reached a leaf - return current
+            if not children:
+                print(f"Reached leaf element: {current.tag}")
+                return current
+
+            # Drop blacklisted children (with their tail text) and collect the
+            # word counts of the rest
+            child_word_counts = []
+            removed = False
+
+            for child in children:
+                if not isinstance(child, html.HtmlElement):
+                    continue
+
+                if blacklist.search(child.get("class", "")):
+                    current.remove(child)
+                    removed = True
+                    continue
+                # Filter out children with very few words (likely not content)
+                if (word_count := count_words(child)) < 20:
+                    continue
+
+                child_word_counts.append((child, word_count))
+
+            if not child_word_counts:
+                print(f"No children with substantial text in {current.tag}")
+                return current
+
+            # Removing children changes this element's count; re-merge its pieces
+            if removed:
+                words[current] = self._element_words(current, words)
+
+            # Find child with most words
+            max_child, max_words = max(child_word_counts, key=lambda x: x[1])
+            parent_words = count_words(current)
+
+            # Calculate what percentage of parent's text is in the max child
+            if parent_words > 0:
+                max_ratio = max_words / parent_words
+            else:
+                return current
+
+            print(
+                f"Layer: {current.tag}, class:{current.get('class')} children: {len(children)}, max child: {max_child.tag} ({max_words} words, {max_ratio:.2%} of parent)"
+            )
+
+            # If no single child dominates (text is evenly distributed), stop
+            if max_ratio <= threshold:
+                print(f"Text evenly distributed, stopping at {current.tag}")
+                return current
+
+            # Otherwise, drill down into the child with most text
+            current = max_child
+
+        return current
+
+    def clean(self, page_content: str):
+        """Parse page HTML with lxml and remove noise tags from the entire tree.
+
+        All noise tags are stripped in a single traversal (etree.strip_elements)
+        instead of one //tag scan per noise tag. Like Element.remove(), this also
+        drops the text that follows each removed element.
+        """
+        if self.max_document_size and len(page_content) > self.max_document_size:
+            print(
+                f"Page of {len(page_content)} characters truncated to "
+                f"{self.max_document_size}"
+            )
+            page_content = page_content[: self.max_document_size]
+        tree = html.fromstring(page_content)
+        etree.strip_elements(tree, *self.noise_tags, with_tail=True)
+        return tree
+
+    def extract(self, page_content: str, threshold: float = 0.6) -> str:
+        """Return the main text of a page"""
+        tree = self.clean(page_content)
+        content_element = self.find_content_by_density(tree, threshold=threshold)
+        return content_element.text_content().strip()
+
+    @staticmethod
+    def _xpath_literal(value: str):
+        if '"' not in value:
+            return f'"{value}"'
+        if "'" not in value:
+            return f"'{value}'"
+        return None
+
+    def selector_for(self, element) -> Optional[str]:
+        """Build an XPath that finds `element` again on pages of the same template.
+
+        Prefers the element's id, then its exact class attribute; falls back to
+        the element's absolute path in the tree.
+        """
+        for attribute in ("id", "class"):
+            value = element.get(attribute)
+            # ids/classes carrying long digit runs are usually per-page
+            if value and not re.search(r"\d{4,}", value):
+                literal = self._xpath_literal(value)
+                if literal:
+                    return f"//{element.tag}[@{attribute}={literal}]"
+        return element.getroottree().getpath(element)
+
+    def extract_with_selector(
+        self,
+        page_content: str,
+        selector: Optional[str] = None,
+        threshold: float = 0.6,
+        min_words: int = 100,
+    ) -> Tuple[str, Optional[str], bool]:
+        """Extract the main text, trying a learned content selector first.
+
+        The selector is accepted when it matches exactly one element with at
+        least `min_words` words; its blacklisted children are dropped as the
+        density walk would. Otherwise the full density walk runs.
+
+        Returns:
+            (text, selector to remember for this template or None, whether the
+            given selector was used)
+        """
+        tree = self.clean(page_content)
+        if selector:
+            try:
+                matches = tree.xpath(selector)
+            except etree.XPathError:
+                matches = []
+            if len(matches) == 1 and isinstance(matches[0], html.HtmlElement):
+                node = matches[0]
+                blacklist = self.blacklist_regex
+                for child in list(node):
+                    if isinstance(child, html.HtmlElement) and blacklist.search(
+                        child.get("class", "")
+                    ):
+                        node.remove(child)
+                text = node.text_content().strip()
+                if len(text.split()) >= min_words:
+                    return text, selector, True
+
+        content_element = self.find_content_by_density(tree, threshold=threshold)
+        text = content_element.text_content().strip()
+        learned = None
+        if len(text.split()) >= min_words:
+            learned = self.selector_for(content_element)
+            if len(tree.xpath(learned)) != 1:
+                learned = None
+        return text, learned, False
@@ -0,0 +1,516 @@
+"""
+Structured-fact extraction - turns scraped articles into structured facts with an LLM
+
+Talks to any OpenAI-compatible chat-completions endpoint (Groq by default).
+
+Usage:
+  python src/fact_extraction.py [--input FILE] [--output FILE] [--db FILE] [--limit N]
+                                [--concurrency N] [--rpm N] [--tpm N] [--token-budget N]
+                                [--base-url URL] [--model NAME] [--force-refresh] [--no-cache]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+import time
+from typing import Iterable, List, Optional
+
+import dotenv
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+from article_store import EXTRACTED, SCRAPED, ArticleStore
+from article_stream import JsonlArticleWriter, iter_json_records, iter_jsonl_articles
+from llm_cache import LLMCache
+from seen_index import canonicalize_url
+from text_prep import estimate_tokens, prepare_text
+
+# Part of the LLM cache key: bump it whenever the prompts below change
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = """
+You are an information extraction engine.
+
+Your task is to extract structured facts from a news article.
+You must NOT summarize creatively, speculate, or add opinions.
+You must NOT introduce any information that is not explicitly present in the content.
+
+If information is missing or unclear, use:
+- empty string "" for strings
+- empty array [] for arrays
+- null for unknown values
+
+You must output VALID JSON only.
+No markdown.
+No explanations.
+No extra text.
+SCORING RULES:
+You MUST provide numerical scores between 0.0 and 10.0 for all score fields.
+- Use 0.0 only if the content is completely unrelated.
+- Use 5.0 for moderate relevance/impact.
+- Use 10.0 for global, historical, or life-changing significance.
+Do NOT use null for scores; estimate based on the provided text.
+
+"""
+
+USER_PROMPT = """
+Extract factual, structured information from the following content.
+
+Rules:
+- Be concise but accurate.
+- Use neutral language.
+- Do not rephrase beyond what is necessary for clarity.
+- Scores must be based only on the provided content.
+- Dates must not be inferred.
+- If unsure, mark values as null.
+
+Output strictly in the following JSON schema:
+{
+  "headline": "...",
+  "summary_1_sentence": "...",
+  "key_points": { ... },
+
+  "relevance": 0.0, // Scale 0-10: How focused is the article on the main subject?
+
+  "impact_score": 0.0, // Scale 0-10: How many people or industries does this change?
+
+  "student_relevance": 0.0, // Scale 0-10: How much does this affect academic or career paths?
+
+  "long_term_importance": 0.0, // Scale 0-10: Will this matter in 5 years?
+
+  "deduplication_hint": "Unique identifier (e.g., 'Company_Event_Date')"
+}
+
+CONTENT:
+<<<
+{{ARTICLE_CONTENT}}
+
+ >>>
+"""
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allows `rate_per_minute` units per minute, in bursts of up to `capacity`.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) units after the fact; the
+        balance may go negative, delaying later callers"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """Keeps requests under a requests/minute and a tokens/minute limit.
+
+    Tokens are reserved from an estimate before each request and settled
+    against the usage the provider reports.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, used_tokens: Optional[int]) -> None:
+        if used_tokens is not None:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRY_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+def _wait(retry_state) -> float:
+    """Honor Retry-After on rate-limit responses, else back off exponentially"""
+    error = retry_state.outcome.exception()
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return float(error.response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            pass
+    return wait_random_exponential(multiplier=1, max=60)(retry_state)
+
+
+def parse_fact(response_content: str) -> dict:
+    """Parse the model's JSON answer, tolerating a markdown code fence"""
+    text = response_content.strip()
+    fence = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fence:
+        text = fence.group(1)
+    fact = json.loads(text)
+    if not isinstance(fact, dict):
+        raise ValueError("expected a JSON object")
+    return fact
+
+
+class FactExtractor:
+    """Extracts structured facts from articles with bounded concurrent requests.
+
+    At most `concurrency` requests are in flight, and a RateLimiter keeps them
+    under the provider's requests/minute and tokens/minute limits. Transport
+    errors, 429s and 5xx responses are retried with exponential backoff
+    (Retry-After is honored). Each fact is appended to `output_file` as soon
+    as it arrives, and articles that already have a fact there are skipped.
+
+    Article text is first cleaned and cut to `token_budget` tokens (see
+    text_prep.prepare_text; None keeps every non-duplicate line).
+
+    Facts are also kept in an LLMCache keyed by the article content, prompt
+    version, model and temperature, so unchanged articles never cost a second
+    request. `force_refresh` ignores both the cache and the existing output
+    file and asks the model again for every article; the new facts replace
+    the old ones only once the run has finished.
+
+    With a `store`, facts are saved to the ArticleStore rows of their articles
+    instead of `output_file`.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        concurrency: int = 4,
+        requests_per_minute: float = 30,
+        tokens_per_minute: float = 60_000,
+        max_completion_tokens: int = 1024,
+        max_attempts: int = 6,
+        timeout: float = 60.0,
+        output_file: str = "output/structured_facts.jsonl",
+        cache: Optional[LLMCache] = None,
+        use_cache: bool = True,
+        force_refresh: bool = False,
+        token_budget: Optional[int] = 2000,
+        store: Optional[ArticleStore] = None,
+    ):
+        self.base_url = (
+            base_url or os.getenv("LLM_BASE_URL", "https://api.groq.com/openai/v1")
+        ).rstrip("/")
+        self.api_key = api_key or os.getenv("LLM_API_KEY") or os.getenv("GROQ_API_KEY")
+        self.model = model or os.getenv("LLM_MODEL", "groq/compound-mini")
+        self.temperature = temperature
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_completion_tokens = max_completion_tokens
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.output_file = output_file
+        self.cache = (cache if cache is not None else LLMCache()) if use_cache else None
+        self.force_refresh = force_refresh
+        self.token_budget = token_budget
+        self.store = store
+        self.stats = {
+            "extracted": 0,
+            "failed": 0,
+            "retries": 0,
+            "tokens": 0,
+            "tokens_saved": 0,
+        }
+
+    def build_messages(self, content: str) -> List[dict]:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": USER_PROMPT.replace("{{ARTICLE_CONTENT}}", content),
+            },
+        ]
+
+    async def _complete(self, client: httpx.AsyncClient, messages: List[dict]) -> str:
+        """One rate-limited chat completion, retried on transient failures"""
+        estimated = self.max_completion_tokens + sum(
+            estimate_tokens(m["content"]) for m in messages
+        )
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception(_is_retryable),
+            wait=_wait,
+            stop=stop_after_attempt(self.max_attempts),
+            reraise=True,
+        ):
+            with attempt:
+                if attempt.retry_state.attempt_number > 1:
+                    self.stats["retries"] += 1
+                await self.limiter.acquire(estimated)
+                response = await client.post(
+                    "/chat/completions",
+                    json={
+                        "model": self.model,
+                        "messages": messages,
+                        "temperature": self.temperature,
+                        "max_tokens": self.max_completion_tokens,
+                    },
+                )
+                response.raise_for_status()
+                data = response.json()
+        used = (data.get("usage") or {}).get("total_tokens")
+        self.limiter.settle(estimated, used)
+        self.stats["tokens"] += used or estimated
+        return data["choices"][0]["message"]["content"]
+
+    async def extract_one(
+        self, client: httpx.AsyncClient, article: dict
+    ) -> Optional[dict]:
+        """Return the structured fact of one article, or None if extraction failed"""
+        title = article.get("title")
+        prepared = prepare_text(article["content"], self.token_budget)
+        self.stats["tokens_saved"] += prepared.tokens_saved
+        print(
+            f"Prepared {title}: {prepared.tokens_before} -> {prepared.tokens_after} "
+            f"tokens ({prepared.tokens_saved} saved)"
+        )
+
+        fact = None
+        if self.cache is not None:
+            key = self.cache.key(
+                prepared.text, PROMPT_VERSION, self.model, self.temperature
+            )
+            if not self.force_refresh:
+                fact = self.cache.get(key)
+
+        if fact is None:
+            try:
+                response_content = await self._complete(
+                    client, self.build_messages(prepared.text)
+                )
+            except Exception as e:
+                print(f"   - An error occurred processing article: {title}")
+                print(f"   - Error: {e}")
+                return None
+            try:
+                fact = parse_fact(response_content)
+            except ValueError:
+                print(f"   - Failed to decode JSON from response for article: {title}")
+                print(f"   - Response was: {response_content}")
+                return None
+            if self.cache is not None:
+                self.cache.put(key, fact)
+                fact = dict(fact)
+
+        fact["original_article"] = {
+            "title": title,
+            "link": article.get("link"),
+            "published": article.get("published"),
+        }
+        return fact
+
+    def done_links(self) -> set:
+        """Canonical links of the articles that already have a fact on disk"""
+        if self.force_refresh:
+            return set()
+        if self.store is not None:
+            return set(self.store.links(EXTRACTED))
+        if not os.path.exists(self.output_file):
+            return set()
+        return {
+            canonicalize_url(fact["original_article"]["link"])
+            for fact in iter_jsonl_articles(self.output_file)
+            if (fact.get("original_article") or {}).get("link")
+        }
+
+    def _replace_output(self, refresh_file: str) -> None:
+        """Swap in the facts of a finished force-refresh run, keeping the old
+        facts of articles it did not redo (e.g. ones whose request failed)"""
+        if not self.stats["extracted"]:
+            os.remove(refresh_file)
+            print(f"No facts refreshed, kept {self.output_file}")
+            return
+        refreshed = {
+            canonicalize_url(fact["original_article"]["link"])
+            for fact in iter_jsonl_articles(refresh_file)
+            if (fact.get("original_article") or {}).get("link")
+        }
+        if os.path.exists(self.output_file):
+            with JsonlArticleWriter(refresh_file, flush_every=1000) as writer:
+                for fact in iter_jsonl_articles(self.output_file):
+                    link = (fact.get("original_article") or {}).get("link")
+                    if not link or canonicalize_url(link) not in refreshed:
+                        writer.write(fact)
+        os.replace(refresh_file, self.output_file)
+
+    async def run(self, articles: Iterable[dict]) -> int:
+        """Extract facts for every article with content and no fact yet;
+        returns the number of facts written"""
+        done = self.done_links()
+        output = self.store.db_file if self.store is not None else self.output_file
+        pending = [
+            article
+            for article in articles
+            if article.get("content")
+            and canonicalize_url(article["link"]) not in done
+        ]
+        print(
+            f"Extracting facts for {len(pending)} articles "
+            f"({len(done)} already in {output})"
+        )
+        if not pending:
+            return 0
+
+        start = time.perf_counter()
+        slots = asyncio.Semaphore(self.concurrency)
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=self.concurrency),
+        ) as client:
+            # A refresh writes beside the old facts and replaces them only
+            # once it has finished, so a failed run loses nothing
+            refresh_file = None
+            if self.store is not None:
+                writer = self.store.fact_writer()
+            elif self.force_refresh:
+                refresh_file = f"{self.output_file}.tmp"
+                if os.path.exists(refresh_file):
+                    os.remove(refresh_file)
+                writer = JsonlArticleWriter(refresh_file, flush_every=1)
+            else:
+                writer = JsonlArticleWriter(self.output_file, flush_every=1)
+            with writer:
+
+                async def process(index: int, article: dict) -> None:
+                    async with slots:
+                        fact = await self.extract_one(client, article)
+                    if fact is None:
+                        self.stats["failed"] += 1
+                        return
+                    writer.write(fact)
+                    self.stats["extracted"] += 1
+                    print(
+                        f"Processed article {index + 1}/{len(pending)}: "
+                        f"{article.get('title')}"
+                    )
+
+                try:
+                    await asyncio.gather(
+                        *(process(i, article) for i, article in enumerate(pending))
+                    )
+                finally:
+                    if self.cache is not None:
+                        self.cache.save()
+        if refresh_file:
+            self._replace_output(refresh_file)
+
+        elapsed = time.perf_counter() - start
+        print(
+            f"Extracted {self.stats['extracted']} facts in {elapsed:.1f}s "
+            f"({self.stats['failed']} failed, {self.stats['retries']} retries, "
+            f"~{self.stats['tokens']} tokens, ~{self.stats['tokens_saved']} saved "
+            f"by text prep) -> {output}"
+        )
+        if self.cache is not None:
+            print(self.cache.summary())
+        return self.stats["extracted"]
+
+
+def extract_facts(articles: Iterable[dict], **kwargs) -> int:
+    """Synchronous entry point: extract facts with a temporary FactExtractor"""
+    return asyncio.run(FactExtractor(**kwargs).run(articles))
+
+
+def main() -> int:
+    dotenv.load_dotenv()
+    parser = argparse.ArgumentParser(description="Extract structured facts from articles")
+    parser.add_argument(
+        "--input", default=os.getenv("SCRAPER_OUTPUT", "output/scraped_content.json")
+    )
+    parser.add_argument(
+        "--output", default=os.getenv("FACTS_OUTPUT", "output/structured_facts.jsonl")
+    )
+    parser.add_argument(
+        "--db",
+        help="Read scraped articles from and save facts to this article store "
+        "instead of --input/--output",
+    )
+    parser.add_argument("--limit", type=int, help="Only process the first N articles")
+    parser.add_argument(
+        "--concurrency", type=int, default=int(os.getenv("LLM_CONCURRENCY", 4))
+    )
+    parser.add_argument("--rpm", type=float, default=float(os.getenv("LLM_RPM", 30)))
+    parser.add_argument(
+        "--tpm", type=float, default=float(os.getenv("LLM_TPM", 60_000))
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=int(os.getenv("LLM_ARTICLE_TOKENS", 2000)),
+        help="Max article tokens sent per request (0 for no limit)",
+    )
+    parser.add_argument("--base-url")
+    parser.add_argument("--model")
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Ignore cached results and the existing output; ask the model again",
+    )
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    store = ArticleStore(args.db) if args.db else None
+    if store is not None:
+        articles = store.iter_articles(SCRAPED)
+    else:
+        articles = iter_json_records(args.input)
+    if args.limit is not None:
+        articles = itertools.islice(articles, args.limit)
+
+    extract_facts(
+        articles,
+        base_url=args.base_url,
+        model=args.model,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        tokens_per_minute=args.tpm,
+        output_file=args.output,
+        use_cache=not args.no_cache,
+        token_budget=args.token_budget or None,
+        force_refresh=args.force_refresh,
+        store=store,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""
+Persistent conditional-GET cache for RSS feeds
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import feedparser
+import httpx
+
+from discovery import DEFAULT_HEADERS
+
+
+def simplify_entry(entry) -> dict:
+    """Reduce a feedparser entry to the JSON-serializable fields the pipeline uses"""
+    return {
+        "title": entry.get("title", ""),
+        "link": entry.get("link", ""),
+        "tags": [tag.term for tag in entry.tags] if "tags" in entry else [],
+        "published": entry.get("published", "N/A"),
+        "summary": entry.get("summary", "N/A"),
+    }
+
+
+class FeedCache:
+    """On-disk cache of feed validators (ETag/Last-Modified) and parsed entries.
+
+    Each fetch sends a conditional GET. A 304 response is answered from the
+    cached entries without touching feedparser, so an unchanged feed costs one
+    small request and no parse time. `fetch` is safe to call from several
+    threads at once; they share one pooled httpx.Client.
+    """
+
+    def __init__(
+        self,
+        cache_file: str = "output/feed_cache.json",
+        timeout: float = 15.0,
+        client: Optional[httpx.Client] = None,
+    ):
+        self.cache_file = cache_file
+        self.client = client or httpx.Client(
+            headers=DEFAULT_HEADERS, timeout=timeout, follow_redirects=True
+        )
+        self.feeds: Dict[str, dict] = self._load()
+        self.stats = {"fetched": 0, "not_modified": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        """Load cached feeds from disk"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading feed cache {self.cache_file}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the cache back to disk"""
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with self._lock, open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.feeds, f, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
+
+    def _conditional_headers(self, url: str) -> dict:
+        cached = self.feeds.get(url, {})
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def fetch(self, url: str) -> List[dict]:
+        """Return the (simplified) entries of a feed, re-parsing only when it changed"""
+        cached = self.feeds.get(url)
+        try:
+            response = self.client.get(url, headers=self._conditional_headers(url))
+            if response.status_code == 304 and cached is not None:
+                with self._lock:
+                    self.stats["not_modified"] += 1
+                    cached["checked_at"] = datetime.now().isoformat()
+                return cached["entries"]
+            response.raise_for_status()
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            if cached is not None:
+                print(f"Error fetching {url}, serving cached entries: {e}")
+                return cached["entries"]
+            raise
+
+        feed = feedparser.parse(
+            response.content,
+            response_headers={
+                "content-location": str(response.url),
+                "content-type": response.headers.get("content-type", ""),
+            },
+        )
+        entries = [simplify_entry(entry) for entry in feed.entries]
+        with self._lock:
+            self.feeds[url] = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "checked_at": datetime.now().isoformat(),
+                "entries": entries,
+            }
+            self.stats["fetched"] += 1
+        return entries
+
+    def close(self) -> None:
+        self.client.close()
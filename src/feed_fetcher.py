@@ -0,0 +1,75 @@
+"""
+Parallel feed fetching with a per-host connection cap
+"""
+
+import queue
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from feed_cache import FeedCache
+
+
+class ParallelFeedFetcher:
+    """Fetches and parses many feeds concurrently through a FeedCache.
+
+    Feeds are grouped by host and each host gets at most `per_host_limit` lanes;
+    a lane fetches its feeds one after another. Different hosts run in parallel,
+    so wall time grows with the number of hosts rather than the number of feeds,
+    and no single publisher sees more than `per_host_limit` connections from us.
+    """
+
+    def __init__(
+        self,
+        feed_cache: Optional[FeedCache] = None,
+        max_workers: int = 16,
+        per_host_limit: int = 1,
+    ):
+        self.feed_cache = feed_cache or FeedCache()
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+
+    def _lanes(self, rss_urls: List[str]) -> List[List[str]]:
+        """Split feed URLs into per-host lanes (round-robin within a host)"""
+        by_host: Dict[str, List[str]] = defaultdict(list)
+        for url in dict.fromkeys(rss_urls):
+            by_host[urlsplit(url).netloc.lower()].append(url)
+
+        lanes = []
+        for urls in by_host.values():
+            lane_count = min(self.per_host_limit, len(urls))
+            lanes.extend(urls[i::lane_count] for i in range(lane_count))
+        return lanes
+
+    def _run_lane(self, lane: List[str], results: queue.Queue) -> None:
+        for url in lane:
+            try:
+                results.put((url, self.feed_cache.fetch(url), None))
+            except Exception as e:
+                results.put((url, None, e))
+
+    def iter_feeds(self, rss_urls: List[str]) -> Iterator[Tuple[str, List[dict]]]:
+        """Yield (feed_url, entries) as each feed completes.
+
+        Feeds that fail are reported and skipped.
+        """
+        lanes = self._lanes(rss_urls)
+        pending = sum(len(lane) for lane in lanes)
+        if not pending:
+            return
+
+        results: queue.Queue = queue.Queue()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(lanes))
+        ) as executor:
+            for lane in lanes:
+                executor.submit(self._run_lane, lane, results)
+
+            while pending:
+                url, entries, error = results.get()
+                pending -= 1
+                if error is not None:
+                    print(f"Error fetching articles from {url}: {error}")
+                    continue
+                yield url, entries
@@ -0,0 +1,95 @@
+"""
+Per-domain memory of which fetch tier (plain HTTP or browser) works for a site
+"""
+
+import json
+import os
+import re
+from typing import Dict
+from urllib.parse import urlsplit
+
+HTTP = "http"
+BROWSER = "browser"
+
+JS_GATE_MARKERS = re.compile(
+    r"enable javascript|javascript is (?:disabled|required|not enabled)"
+    r"|turn on javascript|checking your browser|are you a robot",
+    re.IGNORECASE,
+)
+
+
+def is_js_gated(text: str) -> bool:
+    """Heuristic check on extracted text for pages that only render (or unlock)
+    with JavaScript, e.g. "please enable JavaScript" or bot-check interstitials"""
+    return JS_GATE_MARKERS.search(text[:2000]) is not None
+
+
+def domain_of(url: str) -> str:
+    host = urlsplit(url).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainTierMemory:
+    """Remembers, per domain, which fetch tier last produced usable content.
+
+    Domains start on the cheap HTTP tier. A failed HTTP attempt moves the domain
+    to the browser tier; every `reprobe_every` browser fetches the HTTP tier is
+    tried again so a site that stops gating content is picked back up.
+    """
+
+    def __init__(
+        self, memory_file: str = "output/domain_tiers.json", reprobe_every: int = 25
+    ):
+        self.memory_file = memory_file
+        self.reprobe_every = reprobe_every
+        self.domains: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        """Load the tier memory from disk"""
+        try:
+            with open(self.memory_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading domain tiers {self.memory_file}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the tier memory back to disk"""
+        os.makedirs(os.path.dirname(self.memory_file) or ".", exist_ok=True)
+        tmp_file = f"{self.memory_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.domains, f, indent=2)
+        os.replace(tmp_file, self.memory_file)
+
+    def _stats(self, url: str) -> dict:
+        return self.domains.setdefault(
+            domain_of(url),
+            {
+                "preferred": HTTP,
+                "http_ok": 0,
+                "http_fail": 0,
+                "browser_ok": 0,
+                "browser_fail": 0,
+                "since_probe": 0,
+            },
+        )
+
+    def tier_for(self, url: str) -> str:
+        """Return the tier to try first for `url`"""
+        stats = self._stats(url)
+        if stats["preferred"] == BROWSER:
+            stats["since_probe"] += 1
+            if stats["since_probe"] >= self.reprobe_every:
+                stats["since_probe"] = 0
+                return HTTP
+        return stats["preferred"]
+
+    def record(self, url: str, tier: str, success: bool) -> None:
+        """Record the outcome of fetching `url` on `tier`"""
+        stats = self._stats(url)
+        stats[f"{tier}_{'ok' if success else 'fail'}"] += 1
+        if tier == HTTP:
+            stats["preferred"] = HTTP if success else BROWSER
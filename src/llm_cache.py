@@ -0,0 +1,103 @@
+"""
+Persistent cache of LLM extraction results, keyed by content and prompt
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, Optional
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(text: str) -> str:
+    """Collapse whitespace so re-scrapes that only reflow text hit the cache"""
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+class LLMCache:
+    """Maps (article content, prompt version, model, temperature) to the
+    structured fact the model returned for it.
+
+    Entries older than `max_age_days` are dropped, and beyond `max_entries`
+    the least recently used ones are evicted, when the cache is saved.
+    """
+
+    def __init__(
+        self,
+        cache_file: str = "output/llm_cache.json",
+        max_entries: int = 20_000,
+        max_age_days: float = 30,
+    ):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 86400
+        self.entries: Dict[str, dict] = self._load()
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self) -> Dict[str, dict]:
+        """Load the cache from disk"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading LLM cache {self.cache_file}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Evict stale and surplus entries, then write the cache back to disk"""
+        self.evict()
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_file, self.cache_file)
+
+    @staticmethod
+    def key(content: str, prompt_version: str, model: str, temperature: float) -> str:
+        payload = json.dumps(
+            [prompt_version, model, temperature, normalize_content(content)]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a copy of the cached result for `key`, counting the hit or miss"""
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry["created_at"] > self.max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["used_at"] = time.time()
+        return json.loads(json.dumps(entry["result"]))
+
+    def put(self, key: str, result: dict) -> None:
+        now = time.time()
+        self.entries[key] = {"result": result, "created_at": now, "used_at": now}
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to `max_entries`; returns the number dropped"""
+        before = len(self.entries)
+        cutoff = time.time() - self.max_age
+        self.entries = {
+            k: e for k, e in self.entries.items() if e["created_at"] >= cutoff
+        }
+        if len(self.entries) > self.max_entries:
+            recent = sorted(
+                self.entries.items(), key=lambda item: item[1]["used_at"], reverse=True
+            )
+            self.entries = dict(recent[: self.max_entries])
+        return before - len(self.entries)
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (
+            f"LLM cache: {self.hits} hits, {self.misses} misses ({rate:.0%}), "
+            f"{len(self.entries)} entries"
+        )
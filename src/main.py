@@ -1,127 +1,97 @@
 from imports import (
     sync_playwright,
     html,
-    BeautifulSoup as bs4,
     yaml,
-    requests,
-    feedparser,
     Article,
     json,
     Client,
     os,
     dotenv,
 )
-from scraper import Scraper
+from async_scraper import scrape_articles
+from article_store import DUPLICATE, EXTRACTED, SCRAPED, ArticleStore
+from discovery import discover_rss_urls
+from fact_extraction import extract_facts
+from near_dupes import NearDuplicateIndex, summary_text
+from seen_index import canonicalize_url
+from feed_cache import FeedCache
+from feed_fetcher import ParallelFeedFetcher
+from category_matcher import CategoryMatcher
 from newsletter_builder import NewsletterBuilder, send_newsletter_to_subscribers
-from typing import Optional
+from typing import Iterator, Optional
 
 
 # getting URL of sites to get their RSS feed link
-def get_rss_urls(publishers: list[str]) -> list[str]:
+def get_rss_urls(
+    publishers: list[str],
+    max_concurrency: int = 32,
+    per_host_limit: int = 2,
+    timeout: float = 10.0,
+) -> list[str]:
     """
-    Given a list of publisher URLs, extract RSS links from their HTML content."""
-    rss_url = set()
-    for publisher in publishers:
-        try:
-            response = requests.get(publisher)
-            html_content = response.text
-            soup = bs4(html_content, "html.parser")
-            head = soup.find("head")
-            if head:
-                rss_link = head.find("link", type="application/rss+xml")
-                if rss_link and rss_link.has_attr("href"):
-                    rss_url.add(rss_link["href"])
-                    print(f"Found RSS link for {publisher}: {rss_link['href']}")
-                else:
-                    print(f"No RSS link found in head for {publisher}")
-            else:
-                print(f"No head tag found for {publisher}")
-        except Exception as e:
-            print(f"Error processing {publisher}: {e}")
-
-    return list(rss_url)
-
-
-def get_articles_urls(rss_urls: list[str]) -> list[Article]:
-    """Given a list of RSS feed URLs, fetch articles from each feed."""
-    articles = []
-    for url in rss_urls:
-        try:
-            feed = feedparser.parse(url)
-            print(f"Number of entries found in {url[10]}...: {len(feed.entries)}")
-            category_set = [
-                "Nvidia",
-                "Google",
-                "Microsoft",
-                "OpenAI",
-                "Meta",
-                "Amazon",
-                "AI",
-                "Artificial Intelligence",
-                "Machine Learning",
-                "Deep Learning",
-                "Neural Networks",
-                "NLP",
-                "Computer Vision",
-                "Robotics",
-                "Data Science",
-                "Big Data",
-                "Analytics",
-                "Tech Giants",
-                "Startups",
-                "Innovation",
-                "Research",
-                "Development",
-                "Cloud Computing",
-                "Edge Computing",
-                "Quantum Computing",
-                "Automation",
-                "Ethics in AI",
-                "AI Policy",
-                "AI Trends",
-                "Elon Musk",
-                "Sam Altman",
-                "AI Funding",
-                "AI Acquisitions",
-                "AI Partnerships",
-                "AI Products",
-                "AI Services",
-                "AI Platforms",
-                "AI Tools",
-                "AI Frameworks",
-                "AI Libraries",
-                "AI Chips",
-                "AI Hardware",
-                "AI Software",
-                "AI Applications",
-                "AI Use Cases",
-                "AI in Healthcare",
-                "AI in Finance",
-                "AI in Education",
-                "AI in Transportation",
-                "AI in Manufacturing",
-                "AI in Retail",
-                "AI in Entertainment",
-                "AI in Gaming",
-                "AI",
-                "Technology",
-            ]
-            for entry in feed.entries:
-                category = [tag.term for tag in entry.tags] if "tags" in entry else []
-                if not any(cat in category_set for cat in category):
+    Given a list of publisher URLs, extract RSS links from their HTML content.
+
+    Publisher pages are fetched concurrently over a shared connection pool
+    (see discovery.RSSDiscovery), each request bounded by `timeout` seconds."""
+    return discover_rss_urls(
+        publishers,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        timeout=timeout,
+    )
+
+
+def iter_articles(
+    rss_urls: list[str],
+    feed_cache: Optional[FeedCache] = None,
+    max_workers: int = 16,
+    per_host_limit: int = 1,
+    matcher: Optional[CategoryMatcher] = None,
+) -> Iterator[Article]:
+    """Given a list of RSS feed URLs, yield matching articles as each feed completes.
+
+    Feeds are fetched in parallel (see feed_fetcher.ParallelFeedFetcher) through a
+    FeedCache, so unchanged feeds are served from output/feed_cache.json after a
+    conditional GET instead of being re-parsed. Entries are kept when the
+    CategoryMatcher (config/categories.yaml) matches their tags, title or summary."""
+    matcher = matcher or CategoryMatcher.from_config()
+    cache = feed_cache or FeedCache()
+    fetcher = ParallelFeedFetcher(
+        cache, max_workers=max_workers, per_host_limit=per_host_limit
+    )
+    try:
+        for url, entries in fetcher.iter_feeds(rss_urls):
+            print(f"Number of entries found in {url}: {len(entries)}")
+            for entry in entries:
+                matched = matcher.match(entry)
+                if not matched:
                     continue
                 article = {
-                    "title": entry.title,
-                    "link": entry.link,
-                    "Category": category,
-                    "published": entry.get("published", "N/A"),
-                    "summary": entry.get("summary", "N/A"),
+                    "title": entry["title"],
+                    "link": entry["link"],
+                    "Category": entry["tags"] or sorted(matched),
+                    "published": entry["published"],
+                    "summary": entry["summary"],
                 }
                 print(article["Category"])
-                articles.append(article)
+                yield article
+    finally:
+        try:
+            cache.save()
         except Exception as e:
-            print(f"Error fetching articles from {url}: {e}")
-    return articles
+            print(f"Error saving feed cache: {e}")
+        print(f"Feed cache: {cache.stats}")
+        if feed_cache is None:
+            cache.close()
+
+
+def get_articles_urls(
+    rss_urls: list[str],
+    feed_cache: Optional[FeedCache] = None,
+    matcher: Optional[CategoryMatcher] = None,
+) -> list[Article]:
+    """Given a list of RSS feed URLs, fetch articles from each feed."""
+    return list(iter_articles(rss_urls, feed_cache=feed_cache, matcher=matcher))
 
 
 def main():
@@ -140,19 +110,58 @@ def main():
 
     rss_urls = get_rss_urls(publishers)
     articles = get_articles_urls(rss_urls)
-    scraper = Scraper()
-
-    content = scraper.scrape(articles)
-
-    if not content:
-        print("No content scraped.")
-        return
-
-    # load scraped_content.json
-    with open("output/scraped_content.json", "r", encoding="utf-8") as f:
-        scraped_articles = json.load(f)
 
-    print(f"Scraped {len(scraped_articles)} articles successfully")
+    # Same story from several publishers: scrape and extract only one copy
+    summary_dupes = NearDuplicateIndex.for_summaries()
+    articles = summary_dupes.filter_new(articles, summary_text, record=False)
+
+    # Stages hand articles over through the article store (ARTICLE_DB);
+    # `python src/article_store.py export` writes the legacy JSON files
+    with ArticleStore() as store:
+        print(f"Added {store.add_articles(articles)} new articles to {store.db_file}")
+        content = scrape_articles(
+            articles,
+            concurrency=int(os.getenv("SCRAPER_CONCURRENCY", 4)),
+            store=store,
+        )
+
+        # Remember only the stories that were scraped: if a kept copy failed,
+        # its near-duplicates from other publishers get their turn next run
+        statuses = store.statuses(a["link"] for a in articles)
+        summary_dupes.add_stories(
+            (
+                a
+                for a in articles
+                if statuses.get(canonicalize_url(a["link"]))
+                in (SCRAPED, DUPLICATE, EXTRACTED)
+            ),
+            summary_text,
+        )
+        summary_dupes.save()
+
+        if not content:
+            print("No content scraped.")
+            return
+
+        # Only articles scraped but not yet extracted (this run's or an
+        # interrupted run's) are read back
+        scraped = list(store.iter_articles(SCRAPED))
+        print(f"{len(scraped)} scraped articles awaiting fact extraction")
+
+        content_dupes = NearDuplicateIndex()
+        unique_articles = content_dupes.filter_new(scraped)
+        content_dupes.save()
+        kept = {article["link"] for article in unique_articles}
+        store.mark_duplicates(a["link"] for a in scraped if a["link"] not in kept)
+
+        extract_facts(
+            unique_articles,
+            concurrency=int(os.getenv("LLM_CONCURRENCY", 4)),
+            requests_per_minute=float(os.getenv("LLM_RPM", 30)),
+            tokens_per_minute=float(os.getenv("LLM_TPM", 60_000)),
+            token_budget=int(os.getenv("LLM_ARTICLE_TOKENS", 2000)) or None,
+            store=store,
+        )
 
 
 def send_newsletter(test_email: Optional[str] = None) -> dict:
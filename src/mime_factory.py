@@ -0,0 +1,102 @@
+"""
+Render-once newsletter messages - the shared body is encoded once and per-recipient parts are spliced in
+"""
+
+import binascii
+import re
+import uuid
+from email.policy import SMTP
+from email.utils import formatdate
+from typing import Callable, Dict, List, Optional, Union
+
+# Per-recipient value: a function of the recipient's address
+PerRecipient = Callable[[str], str]
+
+
+def _header(name: str, value: str) -> bytes:
+    """One folded, RFC 2047-encoded header line"""
+    return SMTP.fold_binary(*SMTP.header_store_parse(name, value))
+
+
+def _qp(text: str) -> bytes:
+    """Quoted-printable encoding of `text` (UTF-8) with CRLF line endings"""
+    encoded = binascii.b2a_qp(text.replace("\r\n", "\n").encode("utf-8"), istext=True)
+    return encoded.replace(b"\n", b"\r\n")
+
+
+class MessageFactory:
+    """Builds the raw bytes of one HTML newsletter for many recipients.
+
+    The shared headers and the HTML part are rendered and encoded once. The
+    body is quoted-printable, so it can be cut around the `tokens` it contains
+    (such as "{unsubscribe_link}") and each token's per-recipient value
+    spliced in between soft line breaks without re-encoding the rest. Per
+    message, only `headers` (To, Message-ID and any extra ones) and the token
+    values are rendered, so the cost of a message is the size of its headers
+    rather than of its body. Send the result with `smtplib.SMTP.sendmail`.
+    """
+
+    def __init__(
+        self,
+        html: str,
+        subject: str,
+        from_header: str,
+        tokens: Optional[Dict[str, PerRecipient]] = None,
+        headers: Optional[Dict[str, PerRecipient]] = None,
+        msgid_domain: str = "localhost",
+    ):
+        self.tokens = tokens or {}
+        self.headers = headers or {}
+        self.msgid_domain = msgid_domain
+        boundary = f"=============={uuid.uuid4().hex}=="
+        self._head = b"".join(
+            _header(name, value)
+            for name, value in (
+                ("Subject", subject),
+                ("From", from_header),
+                ("Date", formatdate(localtime=True)),
+                ("MIME-Version", "1.0"),
+                ("Content-Type", f'multipart/alternative; boundary="{boundary}"'),
+            )
+        )
+        self._part_head = (
+            f"\r\n--{boundary}\r\n"
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "MIME-Version: 1.0\r\n"
+            "Content-Transfer-Encoding: quoted-printable\r\n\r\n"
+        ).encode("ascii")
+        self._tail = f"\r\n--{boundary}--\r\n".encode("ascii")
+        self._body: List[Union[bytes, str]] = self._split(html)
+
+    def _split(self, html: str) -> List[Union[bytes, str]]:
+        """Encoded body segments, with token names (str) where values go"""
+        if not self.tokens:
+            return [_qp(html)]
+        pattern = re.compile("|".join(re.escape(token) for token in self.tokens))
+        body: List[Union[bytes, str]] = []
+        start = 0
+        for match in pattern.finditer(html):
+            body.append(_qp(html[start : match.start()]))
+            body.append(match.group(0))
+            start = match.end()
+        body.append(_qp(html[start:]))
+        return body
+
+    def render(self, recipient: str) -> bytes:
+        """The complete message for `recipient`, ready for sendmail"""
+        parts = [
+            self._head,
+            _header("To", recipient),
+            _header("Message-ID", f"<{uuid.uuid4().hex}@{self.msgid_domain}>"),
+        ]
+        for name, value in self.headers.items():
+            parts.append(_header(name, value(recipient)))
+        parts.append(self._part_head)
+        for segment in self._body:
+            if isinstance(segment, bytes):
+                parts.append(segment)
+            else:
+                # Soft line breaks around the value: it decodes as if inline
+                parts += (b"=\r\n", _qp(self.tokens[segment](recipient)), b"=\r\n")
+        parts.append(self._tail)
+        return b"".join(parts)
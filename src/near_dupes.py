@@ -0,0 +1,302 @@
+"""
+Near-duplicate story detection - MinHash signatures with an LSH index
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+
+from category_matcher import TAG_RE, tokenize
+from seen_index import canonicalize_url
+
+MAX_HASH = (1 << 32) - 1
+MERSENNE_PRIME = (1 << 61) - 1
+# Bumped whenever signatures stop being comparable with stored ones
+SIGNATURE_VERSION = 2
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in is it its of on "
+    "or that the their they this to was were which will with would said says".split()
+)
+
+
+def summary_text(article: dict) -> str:
+    return f"{article.get('title', '')} {TAG_RE.sub(' ', article.get('summary', ''))}"
+
+
+def content_text(article: dict) -> str:
+    return article.get("content", "")
+
+
+def shingles(text: str, size: int) -> Set[str]:
+    """Word `size`-grams of `text`; unigrams skip stopwords and very short words"""
+    tokens = tokenize(text)
+    if size == 1:
+        return {t for t in tokens if len(t) > 2 and t not in STOPWORDS}
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def shingle_hashes(items: Iterable[str]) -> List[int]:
+    """32-bit hashes of a set of shingles, stable across runs"""
+    return sorted(
+        {
+            int.from_bytes(
+                hashlib.blake2b(item.encode(), digest_size=4).digest(), "little"
+            )
+            for item in items
+        }
+    )
+
+
+class MinHasher:
+    """MinHash with `num_perm` independent hash functions.
+
+    Function i maps a shingle hash x to (a_i * x + b_i) mod 2^61 - 1, and the
+    signature keeps each function's minimum over the set. The coefficients
+    are derived from a fixed seed, so signatures stay comparable across runs.
+    Unlike one-permutation MinHash, every slot sees every shingle, which keeps
+    the estimate usable on short sets such as a title and a summary.
+    """
+
+    def __init__(self, num_perm: int = 96, seed: int = 1):
+        self.num_perm = num_perm
+        coefficients = [
+            hashlib.blake2b(f"{seed}:{i}".encode(), digest_size=8).digest()
+            for i in range(num_perm)
+        ]
+        # Below 2^31, so a * x + b fits in 64 bits for 32-bit x
+        self.a = np.array(
+            [int.from_bytes(c[:4], "little") % (1 << 31) | 1 for c in coefficients],
+            dtype=np.uint64,
+        )
+        self.b = np.array(
+            [int.from_bytes(c[4:], "little") % (1 << 31) for c in coefficients],
+            dtype=np.uint64,
+        )
+
+    def signature(self, hashes: Sequence[int]) -> Optional[List[int]]:
+        """Return the signature of a set of shingle hashes, or None if it is empty"""
+        if not hashes:
+            return None
+        values = np.asarray(hashes, dtype=np.uint64)[:, None] * self.a + self.b
+        return (values % MERSENNE_PRIME & MAX_HASH).min(axis=0).tolist()
+
+
+def similarity(left: List[int], right: List[int]) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+
+def jaccard(left: Iterable[int], right: Iterable[int]) -> float:
+    """Exact Jaccard similarity of two sets of shingle hashes"""
+    left, right = set(left), set(right)
+    return len(left & right) / len(left | right) if left or right else 0.0
+
+
+class NearDuplicateIndex:
+    """Finds stories that are near-duplicates of ones already seen, in this
+    batch or in earlier runs.
+
+    Each story gets a MinHash signature of its word shingles. An LSH index
+    (signatures cut into `bands` bands, one bucket table per band) yields the
+    few candidates sharing a band with it, and those are confirmed by their
+    Jaccard similarity, so a lookup does not scan every stored story. With
+    `keep_shingles` the shingle hashes are stored too and candidates are
+    confirmed by their exact Jaccard similarity rather than the estimate.
+    Signatures are persisted and forgotten after `max_age_days`.
+
+    With the defaults (96 permutations in 32 bands of 3), stories at the 0.5
+    threshold are found with ~99% probability.
+    """
+
+    def __init__(
+        self,
+        index_file: str = "output/near_dupes_content.json",
+        shingle_size: int = 3,
+        threshold: float = 0.5,
+        num_perm: int = 96,
+        bands: int = 32,
+        max_age_days: float = 14,
+        keep_shingles: bool = False,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.index_file = index_file
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_age = max_age_days * 86400
+        self.keep_shingles = keep_shingles
+        self.hasher = MinHasher(num_perm)
+        self.stories: Dict[str, dict] = self._load()
+        self._rebuild_buckets()
+
+    @classmethod
+    def for_summaries(cls, index_file: str = "output/near_dupes_summary.json"):
+        """Index over title + summary words, for feed entries before scraping.
+
+        These sets are a few dozen words, too few for the MinHash estimate
+        alone, so candidates are confirmed against the stored words.
+        """
+        return cls(index_file, shingle_size=1, keep_shingles=True)
+
+    def _load(self) -> Dict[str, dict]:
+        """Load the stored signatures from disk"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading near-duplicate index {self.index_file}: {e}")
+            return {}
+        if (
+            data.get("version") != SIGNATURE_VERSION
+            or data.get("num_perm") != self.hasher.num_perm
+        ):
+            return {}
+        return data.get("stories", {})
+
+    def save(self) -> None:
+        """Forget old signatures and write the rest back to disk"""
+        cutoff = time.time() - self.max_age
+        self.stories = {
+            link: story
+            for link, story in self.stories.items()
+            if story["added_at"] >= cutoff
+        }
+        self._rebuild_buckets()
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": SIGNATURE_VERSION,
+                    "num_perm": self.hasher.num_perm,
+                    "stories": self.stories,
+                },
+                f,
+            )
+        os.replace(tmp_file, self.index_file)
+
+    def _band_keys(self, signature: List[int]) -> Iterator[Tuple[int, Tuple[int, ...]]]:
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows : (band + 1) * self.rows])
+
+    def _rebuild_buckets(self) -> None:
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = defaultdict(set)
+        for link, story in self.stories.items():
+            for key in self._band_keys(story["signature"]):
+                self.buckets[key].add(link)
+
+    def fingerprint(self, text: str) -> Optional[dict]:
+        """Return the signature (and with `keep_shingles` the shingle hashes)
+        of a story, or None if it has no shingles"""
+        hashes = shingle_hashes(shingles(text, self.shingle_size))
+        signature = self.hasher.signature(hashes)
+        if signature is None:
+            return None
+        if self.keep_shingles:
+            return {"signature": signature, "shingles": hashes}
+        return {"signature": signature}
+
+    def find_duplicate(self, link: str, story: dict) -> Optional[Tuple[str, float]]:
+        """Return (link, similarity) of the closest stored near-duplicate of a
+        story, other than the story itself"""
+        candidates = set()
+        for key in self._band_keys(story["signature"]):
+            candidates |= self.buckets.get(key, set())
+        candidates.discard(link)
+        best = None
+        for candidate in candidates:
+            stored = self.stories[candidate]
+            if "shingles" in story and "shingles" in stored:
+                score = jaccard(story["shingles"], stored["shingles"])
+            else:
+                score = similarity(story["signature"], stored["signature"])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (candidate, score)
+        return best
+
+    def add(self, link: str, story: dict) -> None:
+        self._remove(link)
+        for key in self._band_keys(story["signature"]):
+            self.buckets[key].add(link)
+        self.stories[link] = {**story, "added_at": time.time()}
+
+    def _remove(self, link: str) -> Optional[dict]:
+        """Drop a story from the index; returns its entry, if it had one"""
+        previous = self.stories.pop(link, None)
+        if previous:
+            for key in self._band_keys(previous["signature"]):
+                self.buckets[key].discard(link)
+        return previous
+
+    def add_stories(
+        self, articles: Iterable[dict], text_of: Callable[[dict], str] = content_text
+    ) -> None:
+        """Add `articles` to the index (e.g. once they were scraped after a
+        `filter_new(..., record=False)`)"""
+        for article in articles:
+            story = self.fingerprint(text_of(article))
+            if story is not None:
+                self.add(canonicalize_url(article["link"]), story)
+
+    def filter_new(
+        self,
+        articles: Iterable[dict],
+        text_of: Callable[[dict], str] = content_text,
+        record: bool = True,
+    ) -> List[dict]:
+        """Keep the first story of each near-duplicate cluster and drop the rest.
+
+        Kept stories are added to the index. With `record=False` they only
+        stand for their cluster within `articles` and the index is left as it
+        was, so a story whose kept copy later fails is not suppressed in
+        future runs; call `add_stories` for the copies that worked out.
+        """
+        kept = []
+        added: Dict[str, Optional[dict]] = {}
+        dropped = 0
+        for article in articles:
+            link = canonicalize_url(article["link"])
+            story = self.fingerprint(text_of(article))
+            if story is None:
+                kept.append(article)
+                continue
+            duplicate = self.find_duplicate(link, story)
+            if duplicate:
+                dropped += 1
+                print(
+                    f"Near-duplicate ({duplicate[1]:.2f}) of {duplicate[0]}, "
+                    f"skipping {link}"
+                )
+                continue
+            if link not in added:
+                added[link] = self.stories.get(link)
+            self.add(link, story)
+            kept.append(article)
+        if not record:
+            for link, previous in added.items():
+                self._remove(link)
+                if previous:
+                    self.stories[link] = previous
+                    for key in self._band_keys(previous["signature"]):
+                        self.buckets[key].add(link)
+        print(f"Near-duplicate check: kept {len(kept)}, dropped {dropped}")
+        return kept
@@ -4,31 +4,77 @@ Newsletter builder - converts structured facts and articles into newsletters
 
 import json
 import logging
-from typing import List, Optional
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 from datetime import datetime
 from email_service import NewsletterSender
+from article_store import ArticleStore
+from article_stream import iter_json_records
+from ranking import ArticleRanker
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
 class NewsletterBuilder:
-    """Builds newsletters from structured facts and articles"""
+    """Builds newsletters from structured facts and articles.
+
+    Articles and facts are read from the ArticleStore (`ARTICLE_DB`), limited
+    to those published in the last `days` days; the ranking scores are
+    written back to it. Unless a `store` is passed, each method opens the
+    store only for as long as it needs it. Passing either file argument reads
+    the legacy scraped-content and structured-facts files instead.
+    """
 
     def __init__(
         self,
-        structured_facts_file: str = "output/structured_facts.json",
-        scraped_content_file: str = "output/scraped_content.json",
+        structured_facts_file: Optional[str] = None,
+        scraped_content_file: Optional[str] = None,
+        ranker: Optional[ArticleRanker] = None,
+        top_k: int = 10,
+        store: Optional[ArticleStore] = None,
+        days: float = 7,
     ):
-        self.structured_facts_file = structured_facts_file
-        self.scraped_content_file = scraped_content_file
+        self.store = store
+        self.use_store = store is not None or not (
+            structured_facts_file or scraped_content_file
+        )
+        self.days = days
+        self.structured_facts_file = structured_facts_file or os.getenv(
+            "FACTS_OUTPUT", "output/structured_facts.jsonl"
+        )
+        self.scraped_content_file = scraped_content_file or os.getenv(
+            "SCRAPER_OUTPUT", "output/scraped_content.json"
+        )
+        self.ranker = ranker if ranker is not None else ArticleRanker.from_config()
+        self.top_k = top_k
+
+    def since(self) -> float:
+        """Oldest publish time of the articles considered"""
+        return time.time() - self.days * 86400
+
+    @contextmanager
+    def _open_store(self) -> Iterator[Optional[ArticleStore]]:
+        """The store to use: the one passed in, one opened (and closed) for
+        the caller, or None when reading the legacy files"""
+        if self.store is not None or not self.use_store:
+            yield self.store
+            return
+        with ArticleStore() as store:
+            yield store
 
     def load_structured_facts(self) -> List[dict]:
-        """Load structured facts from JSON file"""
+        """Load structured facts (fact_extraction.py output, .jsonl or .json)"""
+        with self._open_store() as store:
+            return self._load_structured_facts(store)
+
+    def _load_structured_facts(self, store: Optional[ArticleStore]) -> List[dict]:
+        if store is not None:
+            return list(store.iter_facts(since=self.since()))
         try:
-            with open(self.structured_facts_file, "r") as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
+            return list(iter_json_records(self.structured_facts_file))
         except FileNotFoundError:
             logger.warning(
                 f"Structured facts file not found: {self.structured_facts_file}"
@@ -38,20 +84,28 @@ class NewsletterBuilder:
             logger.error(f"Error loading structured facts: {e}")
             return []
 
-    def load_articles(self) -> List[dict]:
-        """Load articles from scraped content"""
+    def iter_articles(self) -> Iterator[dict]:
+        """Yield articles from scraped content (.json, or .jsonl read lazily)"""
+        with self._open_store() as store:
+            yield from self._iter_articles(store)
+
+    def _iter_articles(self, store: Optional[ArticleStore]) -> Iterator[dict]:
+        if store is not None:
+            # The newsletter only needs article metadata, not the full text
+            yield from store.iter_articles(since=self.since(), with_content=False)
+            return
         try:
-            with open(self.scraped_content_file, "r") as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
+            yield from iter_json_records(self.scraped_content_file)
         except FileNotFoundError:
             logger.warning(
                 f"Scraped content file not found: {self.scraped_content_file}"
             )
-            return []
         except Exception as e:
             logger.error(f"Error loading articles: {e}")
-            return []
+
+    def load_articles(self) -> List[dict]:
+        """Load articles from scraped content"""
+        return list(self.iter_articles())
 
     def build_newsletter(
         self,
@@ -62,21 +116,31 @@ class NewsletterBuilder:
         Build newsletter content from articles and facts
 
         Args:
-            articles: List of article dicts (uses scraped_content.json if None)
-            structured_facts: List of fact dicts (uses structured_facts.json if None)
+            articles: List of article dicts (loaded from the store or
+                scraped_content.json if None)
+            structured_facts: List of fact dicts (loaded from the store or
+                structured_facts.jsonl if None)
 
         Returns:
             Dictionary with newsletter content
         """
-        if articles is None:
-            articles = self.load_articles()
-        if structured_facts is None:
-            structured_facts = self.load_structured_facts()
+        with self._open_store() as store:
+            if articles is None:
+                articles = list(self._iter_articles(store))
+            if structured_facts is None:
+                structured_facts = self._load_structured_facts(store)
+
+            # Best-scored articles (structured-fact scores with recency decay)
+            scores = self.ranker.scores(articles, structured_facts)
+            if store is not None:
+                store.set_scores(
+                    (article["link"], score) for article, score in zip(articles, scores)
+                )
 
         newsletter = {
             "title": f"DSEC AI Newsletter - {datetime.now().strftime('%B %d, %Y')}",
             "generated_at": datetime.now().isoformat(),
-            "articles": articles[:10],  # Top 10 articles
+            "articles": self.ranker.select(articles, scores, self.top_k),
             "structured_facts": structured_facts,
             "article_count": len(articles),
             "facts_count": len(structured_facts),
@@ -7,15 +7,23 @@ Usage:
   python newsletter_cli.py add EMAIL [NAME]  # Add subscriber
   python newsletter_cli.py remove EMAIL  # Remove subscriber
   python newsletter_cli.py list          # List all subscribers
+  python newsletter_cli.py import FILE   # Bulk-add subscribers from .csv/.jsonl
+  python newsletter_cli.py export FILE [--all]  # Write subscribers to .csv/.jsonl
 """
 
+import csv
+import itertools
 import sys
 import os
 import json
+import time
+from typing import Iterator
 from dotenv import load_dotenv
-from email_service import SubscriberManager, NewsletterSender
+from email_service import SubscriberManager, NewsletterSender, is_valid_email
 from newsletter_builder import NewsletterBuilder
 
+SUBSCRIBER_FIELDS = ["email", "name", "subscribed_at", "active"]
+
 
 def print_header(text: str):
     """Print formatted header"""
@@ -42,7 +50,8 @@ def cmd_send():
     builder.save_newsletter(newsletter)
     print(f"✅ Newsletter saved to output/newsletter.json")
 
-    result = sender.send_newsletter(articles)
+    # The ranked selection, as saved above
+    result = sender.send_newsletter(newsletter["articles"])
     print(f"\n📧 Newsletter Sending Results:")
     print(f"   Success: {result['success']}")
     print(f"   Failed: {result['failed']}")
@@ -69,7 +78,8 @@ def cmd_test(test_email: str):
         return False
 
     print(f"📰 Found {len(articles)} articles")
-    result = sender.send_newsletter(articles, test_email=test_email)
+    newsletter = builder.build_newsletter(articles=articles)
+    result = sender.send_newsletter(newsletter["articles"], test_email=test_email)
 
     print(f"\n📧 Test Email Result:")
     print(f"   Sent to: {test_email}")
@@ -82,7 +92,7 @@ def cmd_add(email: str, name: str = ""):
     """Add subscriber"""
     print_header(f"Adding Subscriber")
 
-    if not "@" in email or "." not in email:
+    if not is_valid_email(email):
         print("❌ Invalid email address!")
         return False
 
@@ -137,6 +147,95 @@ def cmd_list():
     return True
 
 
+def iter_subscriber_file(path: str) -> Iterator[dict]:
+    """Stream subscriber records from a CSV (with an "email" column, or email
+    and name as the first two columns) or JSON Lines file"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record if isinstance(record, dict) else {}
+            return
+        rows = csv.reader(f)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [column.strip().lower() for column in header]
+        if "email" in columns:
+            email_at = columns.index("email")
+            name_at = columns.index("name") if "name" in columns else None
+        else:
+            email_at, name_at = 0, 1
+            # No header row: the first line is a subscriber too
+            rows = itertools.chain([header], rows)
+        for row in rows:
+            if len(row) > email_at:
+                name = row[name_at] if name_at is not None and len(row) > name_at else ""
+                yield {"email": row[email_at], "name": name}
+
+
+def cmd_import(path: str):
+    """Bulk-import subscribers from a CSV or JSON Lines file"""
+    print_header(f"Importing Subscribers from {path}")
+
+    if not os.path.exists(path):
+        print(f"❌ File not found: {path}")
+        return False
+
+    manager = SubscriberManager()
+    start = time.perf_counter()
+
+    def progress(stats):
+        rate = stats["read"] / max(time.perf_counter() - start, 1e-9)
+        print(
+            f"   {stats['read']:,} rows read, {stats['added']:,} added "
+            f"({rate:,.0f} rows/s)"
+        )
+
+    stats = manager.import_subscribers(iter_subscriber_file(path), progress=progress)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ Imported {stats['added']:,} new subscriber(s) in {elapsed:.1f}s")
+    print(f"   Rows read: {stats['read']:,}")
+    print(f"   Already subscribed or repeated: {stats['duplicates']:,}")
+    print(f"   Invalid addresses: {stats['invalid']:,}")
+    for email in stats["rejected"]:
+        print(f"     - {email!r}")
+    print(f"   Throughput: {stats['read'] / max(elapsed, 1e-9):,.0f} rows/s")
+
+    return True
+
+
+def cmd_export(path: str, include_inactive: bool = False):
+    """Export subscribers to a CSV or JSON Lines file"""
+    print_header(f"Exporting Subscribers to {path}")
+
+    manager = SubscriberManager()
+    start = time.perf_counter()
+    count = 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        jsonl = path.endswith((".jsonl", ".ndjson"))
+        writer = None if jsonl else csv.DictWriter(f, fieldnames=SUBSCRIBER_FIELDS)
+        if writer:
+            writer.writeheader()
+        for subscriber in manager.iter_subscribers(include_inactive=include_inactive):
+            if writer:
+                writer.writerow(subscriber)
+            else:
+                f.write(json.dumps(subscriber, ensure_ascii=False) + "\n")
+            count += 1
+            if count % 50_000 == 0:
+                print(f"   {count:,} subscribers written")
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Exported {count:,} subscriber(s) in {elapsed:.1f}s")
+    print(f"   Throughput: {count / max(elapsed, 1e-9):,.0f} rows/s")
+
+    return True
+
+
 def cmd_stats():
     """Show newsletter statistics"""
     print_header("Newsletter Statistics")
@@ -175,6 +274,8 @@ Commands:
   add EMAIL [NAME]    Add new subscriber
   remove EMAIL        Remove subscriber
   list                List all active subscribers
+  import FILE         Bulk-add subscribers from a .csv or .jsonl file
+  export FILE [--all] Write active (or all) subscribers to a .csv or .jsonl file
   stats               Show newsletter statistics
   help                Show this help message
 
@@ -184,6 +285,8 @@ Examples:
   python newsletter_cli.py add john@example.com "John Doe"
   python newsletter_cli.py remove john@example.com
   python newsletter_cli.py list
+  python newsletter_cli.py import partners.csv
+  python newsletter_cli.py export subscribers.jsonl
   python newsletter_cli.py stats
 """)
 
@@ -222,6 +325,18 @@ def main():
             success = cmd_remove(sys.argv[2])
         elif command == "list":
             success = cmd_list()
+        elif command == "import":
+            if len(sys.argv) < 3:
+                print("❌ Please provide a file to import")
+                print("   Usage: python newsletter_cli.py import FILE")
+                return 1
+            success = cmd_import(sys.argv[2])
+        elif command == "export":
+            if len(sys.argv) < 3:
+                print("❌ Please provide a file to export to")
+                print("   Usage: python newsletter_cli.py export FILE [--all]")
+                return 1
+            success = cmd_export(sys.argv[2], include_inactive="--all" in sys.argv[3:])
         elif command == "stats":
             success = cmd_stats()
         elif command == "help":
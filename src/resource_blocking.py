@@ -0,0 +1,122 @@
+"""
+Resource blocking for Playwright scraping - aborts requests the extractor never uses
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import yaml
+
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font", "stylesheet", "texttrack", "manifest")
+DEFAULT_ESTIMATED_KB = {"image": 60, "media": 500, "font": 40, "stylesheet": 30}
+
+
+def _host_matches(host: str, domains: frozenset) -> bool:
+    """True if `host` is one of `domains` or a subdomain of one"""
+    while host:
+        if host in domains:
+            return True
+        _, _, host = host.partition(".")
+    return False
+
+
+class ResourcePolicy:
+    """Decides which page requests to abort, by resource type and domain.
+
+    allow_domains always win; deny_domains are blocked whatever their type;
+    everything else is blocked when its resource type is in blocked_types.
+    """
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = DEFAULT_BLOCKED_TYPES,
+        deny_domains: Iterable[str] = (),
+        allow_domains: Iterable[str] = (),
+        estimated_kb: Optional[Dict[str, float]] = None,
+    ):
+        self.blocked_types = frozenset(blocked_types)
+        self.deny_domains = frozenset(d.lower() for d in deny_domains)
+        self.allow_domains = frozenset(d.lower() for d in allow_domains)
+        self.estimated_kb = estimated_kb or DEFAULT_ESTIMATED_KB
+
+    @classmethod
+    def from_config(cls, config_file: str = "config/resource_blocking.yaml"):
+        """Build a policy from the resource blocking YAML file"""
+        try:
+            with open(config_file, "r") as f:
+                config = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            print(f"Resource policy {config_file} not found, using defaults")
+            return cls()
+        return cls(
+            blocked_types=config.get("blocked_types", DEFAULT_BLOCKED_TYPES),
+            deny_domains=config.get("deny_domains", []),
+            allow_domains=config.get("allow_domains", []),
+            estimated_kb=config.get("estimated_kb"),
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        host = (urlsplit(url).hostname or "").lower()
+        if _host_matches(host, self.allow_domains):
+            return False
+        if _host_matches(host, self.deny_domains):
+            return True
+        return resource_type in self.blocked_types
+
+
+class ResourceStats:
+    """Blocked-request counters for one page navigation"""
+
+    def __init__(self, policy: ResourcePolicy):
+        self.policy = policy
+        self.blocked: Counter = Counter()
+        self.allowed = 0
+
+    def reset(self) -> None:
+        self.blocked.clear()
+        self.allowed = 0
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        kb = self.policy.estimated_kb
+        return int(
+            1024
+            * sum(
+                count * kb.get(kind, kb.get("other", 0))
+                for kind, count in self.blocked.items()
+            )
+        )
+
+    def summary(self) -> str:
+        kinds = ", ".join(f"{kind}={n}" for kind, n in self.blocked.most_common())
+        return (
+            f"blocked {sum(self.blocked.values())} requests ({kinds or 'none'}), "
+            f"allowed {self.allowed}, ~{self.estimated_bytes_saved / 1024:.0f} KB saved"
+        )
+
+
+async def install_resource_blocking(context, policy: ResourcePolicy) -> ResourceStats:
+    """Route every request of a browser context through `policy`.
+
+    Returns the ResourceStats the route handler updates; with one page per
+    context (as in AsyncScraper's pool) these are the page's statistics.
+    """
+    stats = ResourceStats(policy)
+
+    async def handle(route):
+        request = route.request
+        is_main_document = (
+            request.resource_type == "document" and request.frame.parent_frame is None
+        )
+        if not is_main_document and policy.should_block(
+            request.resource_type, request.url
+        ):
+            stats.blocked[request.resource_type] += 1
+            await route.abort()
+        else:
+            stats.allowed += 1
+            await route.continue_()
+
+    await context.route("**/*", handle)
+    return stats
@@ -1,82 +1,40 @@
-from imports import sync_playwright, html, BeautifulSoup as bs4, Article, json
-import re
+from imports import sync_playwright, BeautifulSoup as bs4, Article
 import traceback
+from collections import deque
+from typing import Optional
+from urllib.parse import urljoin
+from seen_index import SeenIndex, canonicalize_url, find_canonical_link
+from extractor import ContentExtractor
+from extract_pool import ExtractionPool
+from article_stream import JsonlArticleWriter, is_jsonl, merge_json_articles
+from article_store import ArticleStore
 
 
-class Scraper:
+class Scraper(ContentExtractor):
     """A web scraper using Playwright to fetch and interact with web pages."""
 
-    def __init__(self) -> None:
-        """Initializes the Playwright browser and page."""
+    def __init__(
+        self,
+        seen_index: Optional[SeenIndex] = None,
+        extract_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """Initializes the Playwright browser and page.
+
+        Args:
+            seen_index: Index of already-processed articles; defaults to
+                output/seen_articles.json. Articles found in it are never navigated to.
+            extract_workers: Extraction worker processes; defaults to the CPU count.
+            max_pending: Pages fetched but not yet extracted before navigation
+                waits; defaults to twice the number of workers.
+        """
+        super().__init__()
+        self.seen_index = seen_index if seen_index is not None else SeenIndex()
+        self.extraction_pool = ExtractionPool(self, extract_workers)
+        self.max_pending = max_pending or 2 * self.extraction_pool.workers
         self.pw = sync_playwright().start()
         self.browser = self.pw.chromium.launch(headless=False)
         self.page = self.browser.new_page()
-        self.noise_tags = [
-            "script",
-            "style",
-            "noscript",
-            "header",
-            "footer",
-            "meta",
-            "link",
-            "aside",
-            "svg",
-            "img",
-            "nav",
-        ]
-        self.blacklist_words = [
-            "comment",
-            "footer",
-            "header",
-            "nav",
-            "sidebar",
-            "advert",
-            "ads",
-            "sponsor",
-            "related",
-            "popup",
-            "subscribe",
-            "share",
-            "widget",
-            "breadcrumb",
-            "cookie",
-            "consent",
-            "banner",
-            "tool",
-            "button",
-            "form",
-            "input",
-            "search",
-            "login",
-            "signup",
-            "cta",
-            "menu",
-            "social",
-            "follow",
-            "like",
-            "dislike",
-            "rating",
-            "review",
-            "feedback",
-            "poll",
-            "survey",
-            "tag",
-            "tags",
-            "category",
-            "categories",
-            "newsletter",
-            "archive",
-            "copyright",
-            "terms",
-            "privacy",
-            "policy",
-            "disclaimer",
-            "sitemap",
-            "faq",
-            "help",
-            "support",
-            "contact",
-        ]
         # Set a realistic user agent to avoid being blocked
         self.page.set_extra_http_headers(
             {
@@ -84,90 +42,6 @@ class Scraper:
             }
         )
 
-    def find_content_by_density(self, tree, threshold=0.6):
-        """Find the main content container by analyzing text density layer by layer.
-        The Thresold signifies the minimum ratio of text in a child element compared to its parent
-        to continue drilling down.
-
-        Args:
-            tree: lxml element tree (already cleaned of noise tags)
-            threshold: If no child has more than this % of parent's text, stop drilling down
-
-        Returns:
-            The element containing the main content
-        """
-
-        def count_words(element):
-            """Count words in an element's text content."""
-            text = element.text_content().strip()
-            return len(text.split())
-
-        current = tree
-
-        while True:
-            children = list(current)
-            # children is all the tags
-            # iterare through all the children
-            # and check if class name contains blacklist words
-            # if it does, count the number of words in the child
-            # subtract that from the parent's word count
-            # new parent word count = parent word count - child (blacklisted) word count
-
-            # If no children, we've reached a leaf - return current
-            if not children:
-                print(f"Reached leaf element: {current.tag}")
-                return current
-
-            # Count words in each child
-            pattern = (
-                r"(^|[\s_-])("
-                + "|".join(map(re.escape, self.blacklist_words))
-                + r")(?=$|[\s_-])"
-            )
-            regex = re.compile(pattern, re.IGNORECASE)
-            child_word_counts = []
-
-            for child in children:
-                if not isinstance(child, html.HtmlElement):
-                    continue
-
-                if regex.search(child.get("class", "")):
-                    current.remove(child)
-                    continue
-                # Filter out children with very few words (likely not content)
-                if (word_count := count_words(child)) < 20:
-                    continue
-
-                child_word_counts.append((child, word_count))
-
-            if not child_word_counts:
-                print(f"No children with substantial text in {current.tag}")
-                return current
-
-            # Find child with most words
-            max_child, max_words = max(child_word_counts, key=lambda x: x[1])
-            parent_words = count_words(current)
-
-            # Calculate what percentage of parent's text is in the max child
-            if parent_words > 0:
-                max_ratio = max_words / parent_words
-            else:
-                return current
-
-            print(
-                f"Layer: {current.tag}, class:{current.get('class')} children: {len(children)}, max child: {max_child.tag} ({max_words} words, {max_ratio:.2%} of parent)"
-            )
-
-            # If no single child dominates (text is evenly distributed), stop
-            if max_ratio <= threshold:
-                print(f"Text evenly distributed, stopping at {current.tag}")
-                return current
-
-            # Otherwise, drill down into the child with most text
-            current = max_child
-
-        return current
-
     def check_rss(self, url: str) -> bool:
         # redundant now, may be useful later
         """Check if the given URL points to an RSS feed by looking for common RSS tags.
@@ -188,42 +62,116 @@ class Scraper:
             print(f"Error checking RSS for {url}: {e}")
             return False
 
-    def scrape(self, articles: list[Article]) -> bool:
-        output = []
-        for _, article in enumerate(articles):
+    def scrape(
+        self,
+        articles: list[Article],
+        output_file: str = "output/scraped_content.json",
+        store: Optional[ArticleStore] = None,
+    ) -> bool:
+        """Scrape `articles` and write them to `output_file`.
+
+        Navigation and extraction are pipelined: each page's HTML is handed to
+        the extraction pool and the browser moves on to the next article, with
+        at most `max_pending` pages waiting. Results are collected in article
+        order.
+
+        A .jsonl `output_file` is appended to article by article, and articles
+        already in it are skipped, so an interrupted run can be resumed. A .json
+        `output_file` gets the newly scraped articles merged in (see
+        merge_json_articles). With a `store`, articles are saved to the
+        ArticleStore instead of a file.
+        """
+        total = len(articles)
+        articles = self.seen_index.filter_new(articles)
+        print(f"Skipping {total - len(articles)} already-processed articles")
+        writer = None
+        if store is not None:
+            writer = store.content_writer()
+        elif is_jsonl(output_file):
+            writer = JsonlArticleWriter(output_file)
+        if writer:
+            articles = writer.filter_done(articles)
+            writer.open()
+        # (index, article, canonical, future) of pages being extracted, in order
+        pending = deque()
+        pending_canonicals = set()
+
+        def finish(index, article, canonical, future):
             url = article["link"]
             try:
-                self.page.goto(url, wait_until="domcontentloaded")
-                page_content = self.page.content()
-
-                # Parse with lxml and remove noise tags from the entire tree
-                tree = html.fromstring(page_content)
-                for tag in self.noise_tags:
-                    noise_elements = tree.xpath(f"//{tag}")
-                    for el in noise_elements:
-                        el.getparent().remove(el)
-
-                print(f"\n=== Analyzing {url} ===")
-
-                # Use density-based content detection
-                content_element = self.find_content_by_density(tree, threshold=0.6)
-                extracted_text = content_element.text_content().strip()
+                extracted_text = future.result()[0]
+            except Exception as e:
+                print(f"Error extracting {url}: \n {e} {traceback.format_exc()}\n")
+                print(f"Failed...", index + 1)
+                if store is not None:
+                    store.mark_failed(article)
+                return
+            finally:
+                pending_canonicals.discard(canonical)
+            print(f"Chracter count from {url}: {len(extracted_text)}\n")
+            print(f"Word count from {url}: {len(extracted_text.split())}\n")
+            self.seen_index.mark(url, canonical)
+            if writer:
+                writer.write({**article, "content": extracted_text})
+            else:
                 article["content"] = extracted_text
-                print(f"Chracter count from {url}: {len(extracted_text)}\n")
-                print(f"Word count from {url}: {len(extracted_text.split())}\n")
-                print("success...", _ + 1)
+            print("success...", index + 1)
 
-            except Exception as e:
-                print(f"Error navigating to {url}: \n {e} {traceback.format_exc()}\n")
-                print(f"Failed...", _ + 1)
-                continue
-
-        with open(
-            output_file := "output/scraped_content.json", "w", encoding="utf-8"
-        ) as f:
-            json.dump(articles, f, ensure_ascii=False, indent=4)
+        # Close the writer even if the run is interrupted, so its last batch
+        # is flushed and a resumed run skips those articles
+        try:
+            for _, article in enumerate(articles):
+                url = article["link"]
+                try:
+                    self.page.goto(url, wait_until="domcontentloaded")
+                    page_content = self.page.content()
+
+                    canonical = find_canonical_link(page_content)
+                    if canonical:
+                        canonical = urljoin(url, canonical)
+                        if (
+                            canonical in self.seen_index
+                            or canonicalize_url(canonical) in pending_canonicals
+                        ):
+                            print(
+                                f"Duplicate of already-processed {canonical}, skipping"
+                            )
+                            continue
+
+                    print(f"\n=== Analyzing {url} ===")
+
+                    # Remove noise tags and use density-based content detection,
+                    # in a worker process while the browser loads the next page
+                    future = self.extraction_pool.submit(page_content, None, 0.6)
+
+                except Exception as e:
+                    print(
+                        f"Error navigating to {url}: \n {e} {traceback.format_exc()}\n"
+                    )
+                    print(f"Failed...", _ + 1)
+                    if store is not None:
+                        store.mark_failed(article)
+                    continue
+
+                if canonical:
+                    canonical = canonicalize_url(canonical)
+                    pending_canonicals.add(canonical)
+                pending.append((_, article, canonical, future))
+                while len(pending) >= self.max_pending:
+                    finish(*pending.popleft())
+
+            while pending:
+                finish(*pending.popleft())
+        finally:
+            if writer:
+                writer.close()
+
+        if not writer:
+            merge_json_articles(output_file, articles)
+        self.seen_index.save()
         return True
 
     def close(self) -> None:
         self.browser.close()
         self.pw.stop()
+        self.extraction_pool.close()
@@ -0,0 +1,142 @@
+"""
+Persistent index of already-processed articles, keyed by canonical URL
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "cmp",
+    "cmpid",
+    "ito",
+    "smid",
+    "smtyp",
+    "guccounter",
+    "guce_referrer",
+    "guce_referrer_sig",
+    "ref",
+    "ref_src",
+    "referrer",
+    "src",
+    "share",
+    "partner",
+    "taid",
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_", "mtm_", "__")
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+CANONICAL_LINK_RE = re.compile(
+    r"<link\b[^>]*\brel=[\"']?canonical[\"']?[^>]*>", re.IGNORECASE
+)
+HREF_RE = re.compile(r"\bhref=[\"']?([^\"' >]+)", re.IGNORECASE)
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize an article URL so that copies of the same article compare equal.
+
+    Scheme and host are lower-cased (http is treated as https, "www." and default
+    ports are dropped), tracking parameters and fragments are removed, remaining
+    query parameters are sorted and trailing slashes are stripped.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key.lower() not in TRACKING_PARAMS
+            and not key.lower().startswith(TRACKING_PREFIXES)
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def find_canonical_link(page_content: str) -> Optional[str]:
+    """Return the href of the page's <link rel="canonical">, if any"""
+    head_end = HEAD_END_RE.search(page_content)
+    match = CANONICAL_LINK_RE.search(
+        page_content if head_end is None else page_content[: head_end.start()]
+    )
+    if not match:
+        return None
+    href = HREF_RE.search(match.group(0))
+    return href.group(1) if href else None
+
+
+class SeenIndex:
+    """Remembers which articles have been processed, across runs.
+
+    Keys are canonical URLs; both the feed link and the page's rel=canonical
+    URL (once the page has been fetched) are recorded for each article.
+    """
+
+    def __init__(self, index_file: str = "output/seen_articles.json"):
+        self.index_file = index_file
+        self.seen: Dict[str, str] = self._load()
+
+    def _load(self) -> Dict[str, str]:
+        """Load the index from disk"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading seen index {self.index_file}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the index back to disk"""
+        os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.seen, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self.seen
+
+    def __len__(self) -> int:
+        return len(self.seen)
+
+    def mark(self, url: str, canonical_url: Optional[str] = None) -> None:
+        """Record an article (and its page-declared canonical URL) as processed"""
+        now = datetime.now().isoformat()
+        for candidate in (url, canonical_url):
+            if candidate:
+                self.seen.setdefault(canonicalize_url(candidate), now)
+
+    def filter_new(self, articles: Iterable[dict]) -> List[dict]:
+        """Drop articles seen in earlier runs and repeats within this batch"""
+        batch = set()
+        new_articles = []
+        for article in articles:
+            key = canonicalize_url(article["link"])
+            if key in self.seen or key in batch:
+                continue
+            batch.add(key)
+            new_articles.append(article)
+        return new_articles
@@ -0,0 +1,84 @@
+"""
+Learned per-domain content selectors
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+from fetch_tiers import domain_of
+
+
+class SelectorProfiles:
+    """Remembers, per domain, the XPath of the content container the density
+    walk chose, with hit/miss counts.
+
+    Articles of one publisher share a template, so the learned selector usually
+    finds the content with a single XPath lookup (see
+    ContentExtractor.extract_with_selector); a miss falls back to the full walk,
+    whose result replaces the stored selector.
+    """
+
+    def __init__(self, profiles_file: str = "output/selector_profiles.json"):
+        self.profiles_file = profiles_file
+        self.domains: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        """Load the profiles from disk"""
+        try:
+            with open(self.profiles_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error loading selector profiles {self.profiles_file}: {e}")
+            return {}
+
+    def save(self) -> None:
+        """Write the profiles back to disk"""
+        os.makedirs(os.path.dirname(self.profiles_file) or ".", exist_ok=True)
+        tmp_file = f"{self.profiles_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(self.domains, f, indent=2)
+        os.replace(tmp_file, self.profiles_file)
+
+    def selector_for(self, url: str) -> Optional[str]:
+        """Return the learned content selector for the domain of `url`, if any"""
+        profile = self.domains.get(domain_of(url))
+        return profile["selector"] if profile else None
+
+    def record(self, url: str, selector: Optional[str], hit: bool) -> None:
+        """Record the outcome of one extraction.
+
+        Args:
+            url: The article URL
+            selector: The selector that was used (on a hit) or learned (on a miss)
+            hit: Whether the learned selector produced the content
+        """
+        domain = domain_of(url)
+        profile = self.domains.get(domain)
+        if profile is None:
+            if selector:
+                self.domains[domain] = {
+                    "selector": selector,
+                    "hits": 0,
+                    "misses": 0,
+                    "learned_at": datetime.now().isoformat(),
+                }
+            return
+
+        if hit:
+            profile["hits"] += 1
+            return
+
+        profile["misses"] += 1
+        if selector and selector != profile["selector"]:
+            profile["selector"] = selector
+            profile["learned_at"] = datetime.now().isoformat()
+
+    def hit_rate(self) -> float:
+        hits = sum(p["hits"] for p in self.domains.values())
+        total = hits + sum(p["misses"] for p in self.domains.values())
+        return hits / total if total else 0.0
@@ -0,0 +1,275 @@
+"""
+SMTP connection pool - sends messages over several authenticated connections from worker threads
+"""
+
+import logging
+import queue
+import smtplib
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def connection_lost(error: Exception) -> bool:
+    """Whether `error` means the connection is gone (rather than that this
+    message or recipient was refused), so the message is worth retrying on a
+    new connection"""
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: the server is closing the transmission channel
+        return error.smtp_code == 421
+    # SMTPException subclasses OSError; anything else here is a socket error
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class PooledConnection:
+    """One SMTP connection owned by one worker thread.
+
+    The connection is replaced after `max_messages` messages, and reopened
+    (with the message retried up to `max_retries` times) when the server
+    drops it. If it cannot be reopened, `send` returns None and the message
+    is left for another connection.
+    """
+
+    def __init__(
+        self,
+        index: int,
+        connect: Callable[[], Optional[smtplib.SMTP]],
+        max_messages: int = 100,
+        max_retries: int = 1,
+    ):
+        self.index = index
+        self.connect = connect
+        self.max_messages = max_messages
+        self.max_retries = max_retries
+        self.server: Optional[smtplib.SMTP] = None
+        self.sent_on_connection = 0
+        self.stats = {
+            "connection": index,
+            "sent": 0,
+            "failed": 0,
+            "connects": 0,
+            "recycled": 0,
+            "reconnects": 0,
+            "seconds": 0.0,
+        }
+
+    def open(self) -> bool:
+        self.close()
+        self.server = self.connect()
+        self.sent_on_connection = 0
+        if self.server is not None:
+            self.stats["connects"] += 1
+        return self.server is not None
+
+    def close(self) -> None:
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except Exception:
+            self.server.close()
+        self.server = None
+
+    def send(
+        self, recipient: str, send_one: Callable[[smtplib.SMTP, str], None]
+    ) -> Optional[bool]:
+        """Send to one recipient with `send_one(server, recipient)`; returns
+        whether it was accepted, or None if no connection could be opened (the
+        recipient was not sent and should go to another connection)"""
+        start = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                recycle = self.sent_on_connection >= self.max_messages
+                if self.server is not None and recycle:
+                    self.stats["recycled"] += 1
+                    self.close()
+                if self.server is None:
+                    if attempt:
+                        self.stats["reconnects"] += 1
+                    if not self.open():
+                        logger.warning(f"Connection {self.index} could not reconnect")
+                        return None
+                try:
+                    send_one(self.server, recipient)
+                except Exception as e:
+                    if not connection_lost(e):
+                        logger.error(f"Failed to send to {recipient}: {e}")
+                        break
+                    logger.warning(
+                        f"Connection {self.index} lost sending to {recipient}: {e}"
+                    )
+                    self.close()
+                    continue
+                self.sent_on_connection += 1
+                self.stats["sent"] += 1
+                logger.info(f"Sent to {recipient}")
+                return True
+            else:
+                logger.error(f"Failed to send to {recipient}: connection kept dropping")
+            self.stats["failed"] += 1
+            return False
+        finally:
+            self.stats["seconds"] += time.perf_counter() - start
+
+    def report(self) -> dict:
+        seconds = self.stats["seconds"]
+        return {
+            **self.stats,
+            "seconds": round(seconds, 3),
+            "messages_per_second": round(self.stats["sent"] / seconds, 1)
+            if seconds
+            else 0.0,
+        }
+
+
+class SMTPPool:
+    """Sends to many recipients over `connections` SMTP connections at once.
+
+    Each worker thread owns one PooledConnection and takes recipients from a
+    shared queue, so the recipient list can be a lazy iterator (e.g. a
+    subscriber cursor) consumed by the calling thread; at most four
+    recipients per connection are queued ahead. Connections are recycled
+    after `max_messages` messages and reopened transparently if the server
+    drops them. Only connections that open start a worker, and a worker
+    whose connection cannot be reopened (e.g. the server limits concurrent
+    sessions or throttles logins) puts its recipient back and retires, so
+    recipients only fail for lack of a connection once none is left.
+
+    Usage:
+        pool = SMTPPool(sender._create_connection, connections=4)
+        result = pool.send(recipients, send_one)
+    """
+
+    # Seconds an idle worker or a blocked feeder waits before re-checking
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        connect: Callable[[], Optional[smtplib.SMTP]],
+        connections: int = 4,
+        max_messages: int = 100,
+        max_retries: int = 1,
+    ):
+        self.connections = [
+            PooledConnection(i, connect, max_messages, max_retries)
+            for i in range(max(connections, 1))
+        ]
+        self._lock = threading.Lock()
+        self._live = 0
+        self._pending = 0
+
+    def _work(
+        self,
+        connection: PooledConnection,
+        jobs: queue.Queue,
+        slots: threading.Semaphore,
+        fed: threading.Event,
+        send_one: Callable[[smtplib.SMTP, str], None],
+    ) -> None:
+        try:
+            while True:
+                try:
+                    recipient = jobs.get(timeout=self.POLL_INTERVAL)
+                except queue.Empty:
+                    with self._lock:
+                        if fed.is_set() and not self._pending:
+                            return
+                    continue
+                if connection.send(recipient, send_one) is None:
+                    # Hand the recipient to a connection that is still up
+                    jobs.put(recipient)
+                    logger.warning(f"SMTP connection {connection.index} retired")
+                    return
+                with self._lock:
+                    self._pending -= 1
+                slots.release()
+        finally:
+            with self._lock:
+                self._live -= 1
+            connection.close()
+
+    def _alive(self) -> bool:
+        with self._lock:
+            return self._live > 0
+
+    def send(
+        self,
+        recipients: Iterable[str],
+        send_one: Callable[[smtplib.SMTP, str], None],
+    ) -> dict:
+        """Send to every recipient with `send_one(server, recipient)`.
+
+        Returns {"success", "failed", "connected", "seconds", "connections"},
+        where "connections" is the per-connection throughput report. If no
+        connection can be opened at all, nothing is sent and "connected" is 0.
+        """
+        start = time.perf_counter()
+        opened = [connection for connection in self.connections if connection.open()]
+        if not opened:
+            return {"success": 0, "failed": 0, "connected": 0, "connections": []}
+
+        jobs: queue.Queue = queue.Queue()
+        slots = threading.Semaphore(len(opened) * 4)
+        fed = threading.Event()
+        self._live, self._pending = len(opened), 0
+        workers: List[threading.Thread] = [
+            threading.Thread(
+                target=self._work,
+                args=(connection, jobs, slots, fed, send_one),
+                name=f"smtp-{connection.index}",
+                daemon=True,
+            )
+            for connection in opened
+        ]
+        for worker in workers:
+            worker.start()
+        unsent = 0
+        try:
+            for recipient in recipients:
+                while not slots.acquire(timeout=self.POLL_INTERVAL):
+                    if not self._alive():
+                        break
+                if not self._alive():
+                    unsent += 1
+                    continue
+                with self._lock:
+                    self._pending += 1
+                jobs.put(recipient)
+        finally:
+            fed.set()
+            for worker in workers:
+                worker.join()
+
+        # Recipients put back by the last connection to retire
+        while not jobs.empty():
+            jobs.get_nowait()
+            unsent += 1
+        if unsent:
+            logger.error(
+                f"{unsent} recipients not sent: no SMTP connection left to send them"
+            )
+
+        reports = [connection.report() for connection in self.connections]
+        elapsed = time.perf_counter() - start
+        for report in reports:
+            logger.info(
+                f"SMTP connection {report['connection']}: {report['sent']} sent, "
+                f"{report['failed']} failed, {report['reconnects']} reconnects, "
+                f"{report['messages_per_second']} msg/s"
+            )
+        success = sum(report["sent"] for report in reports)
+        logger.info(
+            f"Sent {success} messages over {len(opened)} connections in "
+            f"{elapsed:.1f}s ({success / elapsed if elapsed else 0:.1f} msg/s)"
+        )
+        return {
+            "success": success,
+            "failed": sum(report["failed"] for report in reports) + unsent,
+            "connected": len(opened),
+            "seconds": round(elapsed, 3),
+            "connections": reports,
+        }
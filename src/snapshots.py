@@ -0,0 +1,199 @@
+"""
+Compressed raw-HTML snapshot store with offline re-extraction
+
+Usage:
+  python src/snapshots.py re-extract [--threshold 0.6] [--add-blacklist WORD ...]
+                                     [--remove-blacklist WORD ...] [--noise-tags TAG ...]
+                                     [--workers N] [--output FILE]
+  python src/snapshots.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import lzma
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from extractor import ContentExtractor
+
+CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+class SnapshotStore:
+    """Content-addressed store of fetched page HTML.
+
+    Page bodies are compressed with a stdlib codec and stored once per distinct
+    content under objects/<sha256[:2]>/<sha256>.<codec>. index.jsonl records one
+    line per fetch (url, fetched_at, sha256, codec), so the same URL can have
+    several snapshots over time while unchanged pages share one object.
+    """
+
+    def __init__(self, root: str = "output/snapshots", codec: str = "zlib"):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown snapshot codec: {codec}")
+        self.root = root
+        self.codec = codec
+        self.index_file = os.path.join(root, "index.jsonl")
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{codec}")
+
+    def put(self, url: str, page_content: str, fetched_at: Optional[str] = None) -> str:
+        """Store a fetched page and return its content digest"""
+        raw = page_content.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest, self.codec)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(CODECS[self.codec][0](raw))
+            os.replace(tmp_path, path)
+
+        record = {
+            "url": url,
+            "fetched_at": fetched_at or datetime.now().isoformat(),
+            "sha256": digest,
+            "codec": self.codec,
+            "size": len(raw),
+        }
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.index_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        return digest
+
+    def get(self, digest: str, codec: Optional[str] = None) -> str:
+        """Return the HTML stored under `digest`"""
+        codec = codec or self.codec
+        with open(self._object_path(digest, codec), "rb") as f:
+            return CODECS[codec][1](f.read()).decode("utf-8")
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield every index record, oldest first"""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def latest_records(self) -> List[dict]:
+        """Return the most recent snapshot record of each URL"""
+        latest: Dict[str, dict] = {}
+        for record in self.iter_records():
+            latest[record["url"]] = record
+        return list(latest.values())
+
+
+def _extract_snapshot(args) -> dict:
+    """Process-pool worker: re-run the extraction pipeline over one snapshot"""
+    root, extractor, threshold, record = args
+    try:
+        page_content = SnapshotStore(root).get(record["sha256"], record.get("codec"))
+        text = extractor.extract(page_content, threshold)
+        error = None
+    except Exception as e:
+        text, error = "", str(e)
+    return {
+        "link": record["url"],
+        "fetched_at": record["fetched_at"],
+        "content": text,
+        "word_count": len(text.split()),
+        "error": error,
+    }
+
+
+def re_extract(
+    store: SnapshotStore,
+    extractor: Optional[ContentExtractor] = None,
+    threshold: float = 0.6,
+    workers: Optional[int] = None,
+    output_file: str = "output/reextracted_content.json",
+) -> List[dict]:
+    """Re-run noise removal and density extraction over the latest snapshot of
+    every URL, without network or browser, and write the results to `output_file`"""
+    extractor = extractor or ContentExtractor()
+    records = store.latest_records()
+    if not records:
+        print(f"No snapshots found in {store.root}")
+        return []
+
+    start = time.perf_counter()
+    jobs = [(store.root, extractor, threshold, record) for record in records]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_extract_snapshot, jobs, chunksize=16))
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+
+    failed = sum(1 for r in results if r["error"])
+    print(
+        f"Re-extracted {len(results)} snapshots in {elapsed:.2f}s "
+        f"({len(results) / elapsed:.1f} pages/s, {failed} failed) -> {output_file}"
+    )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Snapshot store tools")
+    parser.add_argument("--root", default="output/snapshots")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser(
+        "re-extract", help="Re-run extraction over stored snapshots"
+    )
+    extract.add_argument("--threshold", type=float, default=0.6)
+    extract.add_argument("--add-blacklist", nargs="*", default=[])
+    extract.add_argument("--remove-blacklist", nargs="*", default=[])
+    extract.add_argument(
+        "--noise-tags", nargs="*", help="Replace the default noise tags"
+    )
+    extract.add_argument("--workers", type=int)
+    extract.add_argument("--output", default="output/reextracted_content.json")
+
+    commands.add_parser("stats", help="Show snapshot counts")
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.root)
+
+    if args.command == "stats":
+        records = list(store.iter_records())
+        print(f"Snapshots: {len(records)}")
+        print(f"URLs: {len({r['url'] for r in records})}")
+        print(f"Distinct pages: {len({r['sha256'] for r in records})}")
+        return 0
+
+    extractor = ContentExtractor()
+    removed = set(args.remove_blacklist)
+    extractor.blacklist_words = [
+        w for w in extractor.blacklist_words if w not in removed
+    ] + args.add_blacklist
+    if args.noise_tags is not None:
+        extractor.noise_tags = args.noise_tags
+
+    re_extract(
+        store,
+        extractor,
+        threshold=args.threshold,
+        workers=args.workers,
+        output_file=args.output,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""
+Text preparation before LLM extraction - trims boilerplate and fits articles to a token budget
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+WHITESPACE_RE = re.compile(r"[^\S\n]+")
+WORD_RE = re.compile(r"\w+")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+(?=[\"'\u201c(]?[A-Z0-9])")
+# Lines longer than this (unbroken text from minified pages) are split into sentences
+LONG_LINE_CHARS = 1000
+# Short lines that are page furniture rather than article text
+BOILERPLATE_RE = re.compile(
+    r"^(advertisement|skip advertisement|related( stories| articles| content)?:?|"
+    r"read more|more on this story|share( this( article| story)?)?|sign up|"
+    r"subscribe|photograph:.*|image:.*|copy link|comments?( \(\d+\))?)\W*$",
+    re.IGNORECASE,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+class PreparedText(NamedTuple):
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def dedupe_lines(lines: List[str], similarity: float = 0.85) -> List[str]:
+    """Drop boilerplate lines and lines that repeat an earlier one, exactly or
+    with small differences (repeated captions, pull quotes, teaser blurbs).
+
+    Exact repeats are caught by a set of normalized lines. For near-repeats,
+    only earlier lines sharing one of a line's rarest words are compared
+    (prefix filtering: two word sets with Jaccard similarity >= `similarity`
+    must share a word among the first size - ceil(similarity * size) + 1
+    of each, in one fixed order), so long live-blogs and transcripts are not
+    compared line against line.
+    """
+    candidates = []
+    seen_exact = set()
+    for line in lines:
+        if BOILERPLATE_RE.match(line):
+            continue
+        words = WORD_RE.findall(line.casefold())
+        key = " ".join(words)
+        if not key or key in seen_exact:
+            continue
+        seen_exact.add(key)
+        candidates.append((line, frozenset(words)))
+
+    # Rarest words first, so each word's posting list stays short
+    frequency = Counter(word for _, word_set in candidates for word in word_set)
+    kept: List[str] = []
+    kept_words: List[frozenset] = []
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for line, word_set in candidates:
+        size = len(word_set)
+        ordered = sorted(word_set, key=lambda word: (frequency[word], word))
+        prefix = ordered[: size - math.ceil(similarity * size - 1e-9) + 1]
+        others = {i for word in prefix for i in postings.get(word, ())}
+        if any(
+            # sets of very different size cannot reach the threshold
+            min(size, len(kept_words[i])) >= similarity * max(size, len(kept_words[i]))
+            and _jaccard(word_set, kept_words[i]) >= similarity
+            for i in others
+        ):
+            continue
+        for word in prefix:
+            postings[word].append(len(kept))
+        kept_words.append(word_set)
+        kept.append(line)
+    return kept
+
+
+def _importance(paragraph: str) -> float:
+    """Score a paragraph by how much fact-bearing text it carries: long
+    paragraphs with numbers and proper nouns beat short fragments"""
+    words = paragraph.split()
+    if not words:
+        return 0.0
+    numbers = sum(1 for w in words if any(c.isdigit() for c in w))
+    names = sum(1 for w in words[1:] if w[:1].isupper())
+    length = min(len(words), 120) / 120
+    return length + 2 * (numbers + names) / len(words)
+
+
+def fit_to_budget(paragraphs: List[str], budget: int, lede: int = 2) -> List[str]:
+    """Keep the lede, then the most important paragraphs that fit in `budget`
+    tokens, in their original order"""
+    chosen = set(range(min(lede, len(paragraphs))))
+    used = sum(estimate_tokens(paragraphs[i]) for i in chosen)
+    ranked = sorted(
+        range(len(chosen), len(paragraphs)),
+        key=lambda i: _importance(paragraphs[i]),
+        reverse=True,
+    )
+    for i in ranked:
+        cost = estimate_tokens(paragraphs[i])
+        if used + cost <= budget:
+            chosen.add(i)
+            used += cost
+    kept = [paragraphs[i] for i in sorted(chosen)]
+    # A lede longer than the whole budget is cut to it
+    text_budget = budget * 4
+    if sum(len(p) + 1 for p in kept) > text_budget:
+        kept = ["\n".join(kept)[:text_budget]]
+    return kept
+
+
+def prepare_text(text: str, token_budget: Optional[int] = 2000) -> PreparedText:
+    """Normalize whitespace, drop boilerplate and duplicate lines, and fit the
+    article to `token_budget` tokens (None for no limit)"""
+    tokens_before = estimate_tokens(text)
+    lines = []
+    for line in text.splitlines():
+        line = WHITESPACE_RE.sub(" ", line).strip()
+        if len(line) > LONG_LINE_CHARS:
+            lines.extend(SENTENCE_END_RE.split(line))
+        elif line:
+            lines.append(line)
+    paragraphs = dedupe_lines(lines)
+    if token_budget is not None:
+        paragraphs = fit_to_budget(paragraphs, token_budget)
+    prepared = "\n".join(paragraphs)
+    return PreparedText(prepared, tokens_before, estimate_tokens(prepared))